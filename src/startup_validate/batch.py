@@ -0,0 +1,134 @@
+import asyncio
+import csv
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from startup_validate.crew import StartupValidate
+from startup_validate.metrics import get_metrics
+from startup_validate.results import remember_results, reuse_results
+
+
+def load_ideas(path: str) -> List[Dict[str, Any]]:
+    """
+    Load startup ideas from a JSONL or CSV file.
+
+    Each JSONL line (or CSV row) must provide a `startup_idea` field and may
+    provide an `id` (letters, digits, `_` and `-`; it names the output file)
+    and a `prior_idea`: an earlier version of the idea whose stored run is
+    re-validated incrementally. Lines that are blank are skipped.
+    """
+    source = Path(path)
+    if source.suffix.lower() == ".csv":
+        with source.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with source.open(encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    ideas = []
+    for index, row in enumerate(rows, start=1):
+        idea = (row.get("startup_idea") or "").strip()
+        if not idea:
+            raise ValueError(f"Row {index} in {path} has no 'startup_idea'")
+        entry = {"id": str(row.get("id") or index), "startup_idea": idea}
+        if not re.fullmatch(r"[\w-]+", entry["id"]):
+            raise ValueError(f"Row {index} in {path} has an invalid 'id' {entry['id']!r} (use letters, digits, _ and -)")
+        if (row.get("prior_idea") or "").strip():
+            entry["prior_idea"] = row["prior_idea"].strip()
+        ideas.append(entry)
+    return ideas
+
+
+def _slug(text: str, max_length: int = 40) -> str:
+    """Filesystem-safe slug for an idea."""
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:max_length].rstrip("-") or "idea"
+
+
+async def _validate_idea(
+    idea: Dict[str, Any], semaphore: asyncio.Semaphore, output_dir: Path, resume: bool = False
+) -> Dict[str, Any]:
+    """Run one crew for `idea` once a concurrency slot is free."""
+    async with semaphore:
+        output_file = output_dir / f"{idea['id']}-{_slug(idea['startup_idea'])}.md"
+        started = time.perf_counter()
+        entry = {**idea, "output_file": str(output_file)}
+        try:
+            report, seeded = reuse_results(idea["startup_idea"], idea.get("prior_idea"))
+            if report is None:
+                crew_base = StartupValidate(startup_idea=idea["startup_idea"], resume=resume or seeded)
+                try:
+                    res = await crew_base.crew().kickoff_async(inputs={"startup_idea": idea["startup_idea"]})
+                    report = crew_base.final_report(res)
+                    remember_results(idea["startup_idea"], report, crew_base.task_outputs())
+                finally:
+                    crew_base.release()
+            output_file.write_text(report, encoding="utf-8")
+            entry["status"] = "completed"
+        except Exception as e:
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+        entry["duration_seconds"] = round(time.perf_counter() - started, 2)
+        print(f"[{entry['status']}] {idea['id']}: {idea['startup_idea']}")
+        return entry
+
+
+async def run_batch_async(
+    ideas: List[Dict[str, Any]],
+    output_dir: str = "batch_output",
+    concurrency: int = 4,
+    resume: bool = False,
+) -> List[Dict[str, Any]]:
+    """Validate `ideas` concurrently, with at most `concurrency` crews in flight."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    target = Path(output_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(_validate_idea(idea, semaphore, target, resume) for idea in ideas)
+    )
+
+
+def write_index(entries: List[Dict[str, Any]], output_dir: str) -> Path:
+    """Write `index.json` and a readable `index.md` summarising a batch."""
+    target = Path(output_dir)
+    (target / "index.json").write_text(json.dumps(entries, indent=2), encoding="utf-8")
+
+    lines = [
+        "# Batch Validation Index",
+        "",
+        "| ID | Startup idea | Status | Duration (s) | Report |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for entry in entries:
+        report = Path(entry["output_file"]).name if entry["status"] == "completed" else entry.get("error", "")
+        idea = entry["startup_idea"].replace("|", "\\|")
+        lines.append(
+            f"| {entry['id']} | {idea} | {entry['status']} | {entry['duration_seconds']} | {report} |"
+        )
+    index_file = target / "index.md"
+    index_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return index_file
+
+
+def run_batch(
+    path: str,
+    output_dir: str = "batch_output",
+    concurrency: Optional[int] = None,
+    resume: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Validate every idea in `path` and write one report per idea plus an index.
+    With `resume`, ideas pick up from their task checkpoints instead of starting over.
+    Aggregated per-task/per-agent metrics for the whole batch go to `metrics.json`.
+    """
+    ideas = load_ideas(path)
+    metrics = get_metrics()
+    entries = asyncio.run(run_batch_async(ideas, output_dir, concurrency or 4, resume))
+    write_index(entries, output_dir)
+    metrics.write_json(str(Path(output_dir) / "metrics.json"))
+    return entries
@@ -0,0 +1,405 @@
+"""
+Offline benchmark for the crew and flow orchestration.
+
+Gemini is replaced by FakeLLM (scripted ReAct answers after a configurable
+delay) and Serper by a local HTTP stand-in, so the numbers measure our own
+orchestration, caching, rate limiting and logging overhead, not the network.
+
+    benchmark --levels 1 4 16 64 --process dag --output benchmark.json
+    benchmark --compare previous.json
+    benchmark --startup --output startup.json
+
+`--startup` instead measures cold-start cost in fresh interpreters with
+`python -X importtime`: wall time to import the crew, to import the CLI
+and to build a crew, plus the slowest imports.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+from crewai.events.types.llm_events import LLMCallType
+from pydantic import BaseModel
+
+from startup_validate.llm import StartupValidateLLM, override_llm
+from startup_validate.models import TASK_MODELS
+
+SEARCH_TOOL_NAME = "Search the internet with Serper"
+DELEGATE_TOOL_NAME = "Delegate work to coworker"
+
+
+def sample_output(annotation: Any, metadata: Optional[List[Any]] = None) -> Any:
+    """Plausible JSON-ready value for a structured output model or field type."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        return sample_output(next(arg for arg in get_args(annotation) if arg is not type(None)))
+    if origin is list:
+        return [sample_output(get_args(annotation)[0]) for _ in range(2)]
+    if origin is dict:
+        return {"Seed": "$2M", "Series A": "$10M"}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: sample_output(field.annotation, field.metadata) for name, field in annotation.model_fields.items()}
+    upper = next((m.le for m in metadata or [] if hasattr(m, "le")), None)
+    if annotation is int:
+        return 7
+    if annotation is float:
+        return 0.2 if upper is not None and upper <= 1 else 7.2
+    return "TAM $12.5B (2024), CAGR 18% https://example.com/source"
+
+
+class FakeLLM(StartupValidateLLM):
+    """
+    Deterministic stand-in for Gemini. It goes through the real call path
+    (rate limiter, completion cache, crewAI events) and only replaces the
+    provider request: a hierarchical manager delegates once, agents with the
+    search tool issue one search, then every agent returns a canned markdown
+    report; the planner returns a plan.
+    """
+
+    def __init__(self, latency: float = 0.05, report_chars: int = 4000, **kwargs: Any):
+        super().__init__(model="fake/benchmark", temperature=0, stop=["<stop>"], **kwargs)
+        self.latency = latency
+        self.report_chars = report_chars
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 1_000_000
+
+    def respond(self, messages: List[Dict[str, Any]]) -> str:
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        if "list_of_plans_per_task" in prompt or "Task Number 1" in prompt:
+            plans = [
+                {"task_number": n, "task": f"Task {n}", "plan": "Research, analyse, report."}
+                for n in range(1, prompt.count("Task Number ") + 1)
+            ]
+            return "Thought: plan ready\nFinal Answer: " + json.dumps({"list_of_plans_per_task": plans})
+        acted = any(message.get("role") == "assistant" for message in messages)
+        coworkers = re.search(r"following coworkers: (.+)", prompt)
+        if DELEGATE_TOOL_NAME in prompt and coworkers and not acted:
+            coworker = coworkers.group(1).split(",")[0].strip()
+            return (
+                "Thought: I should delegate this\n"
+                f"Action: {DELEGATE_TOOL_NAME}\n"
+                f'Action Input: {json.dumps({"task": "Complete the assigned analysis", "context": "See task", "coworker": coworker})}'
+            )
+        if SEARCH_TOOL_NAME in prompt and not acted:
+            idea = re.search(r"for(?: the startup idea)?: (.+)", prompt)
+            query = (idea.group(1) if idea else "startup")[:80].replace('"', "")
+            return (
+                "Thought: I need market data\n"
+                f"Action: {SEARCH_TOOL_NAME}\n"
+                f'Action Input: {{"search_query": "{query} market size"}}'
+            )
+        body = ("TAM $12.5B (2024), CAGR 18% [1]. Score: 7/10. https://example.com/source\n" * 64)
+        return "Thought: I now know the final answer\nFinal Answer: " + body[: self.report_chars]
+
+    def _fake_response(self, params: Dict[str, Any], from_task: Any, from_agent: Any) -> str:
+        time.sleep(self.latency)
+        response = self.respond(params["messages"])
+        model = getattr(from_task, "output_pydantic", None)
+        if model in TASK_MODELS.values() and "Final Answer:" in response:
+            response = "Thought: I now know the final answer\nFinal Answer: " + json.dumps(sample_output(model))
+        self._handle_emit_call_events(response, LLMCallType.LLM_CALL, from_task, from_agent, params["messages"])
+        return response
+
+    def _handle_non_streaming_response(self, params, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        return self._fake_response(params, from_task, from_agent)
+
+    def _handle_streaming_response(self, params, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        return self._fake_response(params, from_task, from_agent)
+
+
+class FakeSerperServer:
+    """Local HTTP server answering Serper `/search` and `/news` requests after `latency` seconds."""
+
+    def __init__(self, latency: float = 0.02):
+        latency_s = latency
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open, as Serper does, so that pooled sessions reuse them
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                time.sleep(latency_s)
+                query = payload.get("q", "")
+                body = json.dumps({
+                    "searchParameters": {"q": query},
+                    "organic": [
+                        {"title": f"{query} result {n}", "link": f"https://example.com/{n}",
+                         "snippet": "Market size $12.5B, growing 18% a year.", "position": n}
+                        for n in range(1, 6)
+                    ],
+                    "credits": 1,
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FakeSerperServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _run_one(target: str, process: str, idea: str) -> float:
+    started = time.perf_counter()
+    if target == "flow":
+        from startup_validate.plot import StartupValidateFlow
+
+        await StartupValidateFlow().kickoff_async(inputs={"startup_idea": idea})
+    else:
+        from startup_validate.crew import StartupValidate
+
+        await StartupValidate(process=process).crew().kickoff_async(inputs={"startup_idea": idea})
+    return time.perf_counter() - started
+
+
+def run_level(concurrency: int, target: str, process: str, trace_memory: bool) -> Dict[str, Any]:
+    """Validate `concurrency` distinct ideas at once and summarise the run."""
+    from startup_validate.metrics import get_metrics
+
+    metrics = get_metrics()
+    metrics.reset()
+    ideas = [f"Benchmark idea {n}: AI assistant for niche market {n}" for n in range(concurrency)]
+    if trace_memory:
+        tracemalloc.start()
+
+    async def run_all() -> List[float]:
+        return await asyncio.gather(*(_run_one(target, process, idea) for idea in ideas))
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies = asyncio.run(run_all())
+    wall = time.perf_counter() - started
+
+    peak_traced_mb = None
+    if trace_memory:
+        peak_traced_mb = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+    snapshot = metrics.snapshot()
+    overhead = {
+        task: round((row["wall_s"] - row["llm_s"] - row["tool_s"]) / concurrency, 4)
+        for task, row in snapshot["by_task"].items()
+        if row["wall_s"]
+    }
+    return {
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_ideas_per_s": round(concurrency / wall, 3),
+        "latency_s": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "max": round(max(latencies), 3),
+        },
+        "per_task_overhead_s": overhead,
+        "llm_calls": int(snapshot["totals"]["llm_calls"]),
+        "llm_calls_per_idea": round(snapshot["totals"]["llm_calls"] / concurrency, 1),
+        "tool_calls": int(snapshot["totals"]["tool_calls"]),
+        "max_rss_mb": _max_rss_mb(),
+        "peak_traced_mb": peak_traced_mb,
+    }
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> str:
+    """Side-by-side p50 latency, throughput and LLM calls per idea for each concurrency level."""
+    before = {row["concurrency"]: row for row in previous["results"]}
+    lines = [f"{'concurrency':>11} {'p50 s':>16} {'ideas/s':>16} {'LLM calls/idea':>16} {'saved':>7}"]
+    for row in current["results"]:
+        old = before.get(row["concurrency"])
+        if old is None:
+            continue
+        lines.append(
+            f"{row['concurrency']:>11} "
+            f"{old['latency_s']['p50']:>7.3f}->{row['latency_s']['p50']:<7.3f} "
+            f"{old['throughput_ideas_per_s']:>7.3f}->{row['throughput_ideas_per_s']:<7.3f} "
+            f"{old['llm_calls_per_idea']:>7.1f}->{row['llm_calls_per_idea']:<7.1f} "
+            f"{old['llm_calls_per_idea'] - row['llm_calls_per_idea']:>7.1f}"
+        )
+    return "\n".join(lines)
+
+
+def run_benchmark(
+    levels: List[int],
+    target: str = "crew",
+    process: str = "dag",
+    llm_latency: float = 0.05,
+    search_latency: float = 0.02,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """Run every concurrency level against the fake LLM and fake search server."""
+    # Isolated caches and logs, and no quota throttling against the fake backend
+    workdir = tempfile.mkdtemp(prefix="startup-validate-bench-")
+    os.environ.setdefault("CACHE_PATH", os.path.join(workdir, "cache.sqlite"))
+    os.environ.setdefault("RUN_LOG_DIR", os.path.join(workdir, "logs"))
+    os.environ.setdefault("GEMINI_RPM", "1000000")
+    os.environ.setdefault("GEMINI_TPM", "1000000000")
+    os.environ.setdefault("SERPER_API_KEY", "benchmark")
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    override_llm(FakeLLM(latency=llm_latency))
+
+    with FakeSerperServer(latency=search_latency) as server:
+        os.environ["SERPER_BASE_URL"] = server.url
+        results = [run_level(level, target, process, trace_memory) for level in levels]
+
+    try:
+        version = metadata.version("startup_validate")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return {
+        "version": version,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "target": target,
+            "process": process,
+            "llm_latency_s": llm_latency,
+            "search_latency_s": search_latency,
+        },
+        "results": results,
+    }
+
+
+STARTUP_TARGETS = {
+    "import_crew": "import startup_validate.crew",
+    "import_cli": "import startup_validate.main",
+    "build_crew": "from startup_validate.crew import StartupValidate; StartupValidate(process='dag').crew()",
+}
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_startup(statement: str, repeats: int = 5, top: int = 15) -> Dict[str, Any]:
+    """Run `statement` in `repeats` fresh interpreters; median wall time and the slowest imports."""
+    env = {**os.environ, "CREWAI_DISABLE_TELEMETRY": "true", "OTEL_SDK_DISABLED": "true"}
+    code = f"import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+    walls, imports = [], {}
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, env=env, check=True,
+        )
+        walls.append(float(proc.stdout.strip().splitlines()[-1]))
+        for self_us, cumulative_us, indent, module in IMPORTTIME_RE.findall(proc.stderr):
+            # Top-level packages and their direct children only
+            if len(indent) <= 3:
+                imports.setdefault(module, []).append((int(self_us), int(cumulative_us)))
+    slowest = sorted(
+        (
+            {
+                "module": module,
+                "cumulative_ms": round(statistics.median(c for _, c in timings) / 1000, 1),
+                "self_ms": round(statistics.median(s for s, _ in timings) / 1000, 1),
+            }
+            for module, timings in imports.items()
+        ),
+        key=lambda row: -row["cumulative_ms"],
+    )
+    return {
+        "statement": statement,
+        "wall_s": round(statistics.median(walls), 3),
+        "runs_s": [round(wall, 3) for wall in walls],
+        "top_imports": slowest[:top],
+    }
+
+
+def run_startup_benchmark(repeats: int = 5) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "startup": {name: measure_startup(statement, repeats) for name, statement in STARTUP_TARGETS.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline StartupValidate benchmark")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64], help="concurrent ideas per level")
+    parser.add_argument("--target", choices=["crew", "flow"], default="crew")
+    parser.add_argument("--process", choices=["hierarchical", "dag", "fast"], default="dag", help="crew process (crew target only)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="seconds per fake search request")
+    parser.add_argument("--structured", action="store_true", help="enable STRUCTURED_OUTPUTS")
+    parser.add_argument("--trace-memory", action="store_true", help="also report tracemalloc peak (slower)")
+    parser.add_argument("--startup", action="store_true", help="measure interpreter startup and import cost instead")
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per startup measurement")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--compare", help="previous benchmark JSON to compare against")
+    args = parser.parse_args(argv)
+    if args.structured:
+        os.environ["STRUCTURED_OUTPUTS"] = "true"
+
+    if args.startup:
+        report = run_startup_benchmark(args.repeats)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        for name, row in report["startup"].items():
+            print(f"{name}: {row['wall_s']:.3f}s (median of {len(row['runs_s'])})")
+            for entry in row["top_imports"][:5]:
+                print(f"    {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+        print(f"Startup benchmark saved to {args.output}")
+        return
+
+    report = run_benchmark(
+        args.levels, args.target, args.process, args.llm_latency, args.search_latency, args.trace_memory
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for row in report["results"]:
+        print(
+            f"{row['concurrency']:>3} ideas: {row['wall_s']:.2f}s wall, {row['throughput_ideas_per_s']:.2f} ideas/s, "
+            f"p50 {row['latency_s']['p50']:.2f}s, p95 {row['latency_s']['p95']:.2f}s, "
+            f"{row['llm_calls_per_idea']} LLM calls/idea, max RSS {row['max_rss_mb']} MB"
+        )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(report, json.load(f)))
+    print(f"Benchmark saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
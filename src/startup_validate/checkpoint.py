@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from crewai.tasks.task_output import TaskOutput
+
+
+def normalize_idea(startup_idea: str) -> str:
+    """Case-fold and collapse whitespace so trivially different spellings share a key."""
+    return " ".join(startup_idea.casefold().split())
+
+
+def idea_key(startup_idea: str) -> str:
+    """Stable short hash identifying a startup idea."""
+    return hashlib.sha256(normalize_idea(startup_idea).encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Per-idea store of completed task outputs, one JSON file per task:
+    `<CHECKPOINT_DIR>/<idea hash>/<task name>.json`.
+
+    Once a run of the idea finishes, its checkpoints are expired rather than
+    deleted: they stay on disk (the prior research index reads them) but are
+    no longer restored, so a later resume starts a fresh run.
+    """
+
+    def __init__(self, startup_idea: str, root: Optional[str] = None):
+        self.startup_idea = startup_idea
+        self.directory = Path(root or os.getenv("CHECKPOINT_DIR", ".checkpoints")) / idea_key(startup_idea)
+
+    def _path(self, task_name: str) -> Path:
+        return self.directory / f"{task_name}.json"
+
+    @property
+    def _finished_path(self) -> Path:
+        # Not *.json, so neither completed() nor the prior research index reads it as an output
+        return self.directory / "finished"
+
+    def finished_at(self) -> float:
+        """When a run of this idea last finished (0 if none has)."""
+        try:
+            return float(self._finished_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0.0
+
+    def finish(self) -> None:
+        """Expire the checkpoints saved so far: the run they belong to is over."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._finished_path.write_text(repr(time.time()), encoding="utf-8")
+
+    def save(self, output: TaskOutput, source_idea: Optional[str] = None) -> None:
+        """
+        Persist a finished task's output (usable directly as a task callback).
+        `source_idea` records the idea whose run produced an output reused here.
+        """
+        if not output.name:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = {
+            "startup_idea": self.startup_idea,
+            "saved_at": time.time(),
+            "output": output.model_dump(mode="json", exclude={"pydantic", "json_dict"}),
+        }
+        if source_idea is not None:
+            record["source_idea"] = source_idea
+        path = self._path(output.name)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def load(self, task_name: str) -> Optional[TaskOutput]:
+        """Return the stored output for `task_name`, or None if it never completed (or has expired)."""
+        path = self._path(task_name)
+        if not path.exists():
+            return None
+        record = json.loads(path.read_text(encoding="utf-8"))
+        if record["saved_at"] <= self.finished_at():
+            return None
+        return TaskOutput(**record["output"])
+
+    def completed(self) -> Dict[str, TaskOutput]:
+        """All unexpired stored outputs for this idea, keyed by task name."""
+        if not self.directory.exists():
+            return {}
+        outputs = {path.stem: self.load(path.stem) for path in sorted(self.directory.glob("*.json"))}
+        return {name: output for name, output in outputs.items() if output is not None}
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink()
+        self._finished_path.unlink(missing_ok=True)
@@ -0,0 +1,142 @@
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from crewai import Crew, Task
+from crewai.tasks.task_output import TaskOutput
+from crewai.tools import BaseTool
+from crewai.utilities.formatter import DIVIDERS
+from pydantic import BaseModel, Field
+
+from startup_validate.report import SECTION_TITLES, structured_output
+
+URL_RE = re.compile(r"https?://[^\s)\]>\"'<]+")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+SCORE_RE = re.compile(r"\bscores?\b|\brating\b|/\s?10\b|/\s?100\b|\bverdict\b|\brecommend", re.IGNORECASE)
+FIGURE_RE = re.compile(r"\d")
+
+# Default context budget (estimated tokens) per consuming task; 0 passes full text
+DEFAULT_BUDGETS = {
+    "validation_scoring_task": 3000,
+    "manager_report_task": 6000,
+}
+FULL_REPORT_TOOL_NAME = "Read full report"
+MAX_LINE_CHARS = 300
+
+
+def context_budget(consumer: str) -> int:
+    """Token budget for the context passed to `consumer` (CONTEXT_BUDGET_<TASK_NAME> overrides)."""
+    default = DEFAULT_BUDGETS.get(consumer, 0)
+    return int(os.getenv(f"CONTEXT_BUDGET_{consumer.upper()}", str(default)))
+
+
+def _priority(line: str) -> Optional[int]:
+    """Rank a report line for the digest: scores, then sourced figures, figures, headings."""
+    if SCORE_RE.search(line) and FIGURE_RE.search(line):
+        return 0
+    if FIGURE_RE.search(line) and URL_RE.search(line):
+        return 1
+    if FIGURE_RE.search(line) and not HEADING_RE.match(line):
+        return 2
+    if HEADING_RE.match(line):
+        return 3
+    return None
+
+
+def digest(text: str, max_tokens: int) -> str:
+    """
+    Structured digest of a markdown report: headings, scores and lines with
+    figures (in their original order, highest-priority first when the budget
+    is tight), followed by the cited URLs. ~4 characters per token.
+    """
+    max_chars = max_tokens * 4
+    urls = list(dict.fromkeys(url.rstrip(".,;:") for url in URL_RE.findall(text)))
+    sources = ""
+    if urls:
+        sources = "Sources: " + " ".join(urls)
+        sources = sources[: max_chars // 5].rsplit(" ", 1)[0] if len(sources) > max_chars // 5 else sources
+
+    candidates: List[Tuple[int, int, str]] = []
+    seen = set()
+    for position, raw in enumerate(text.splitlines()):
+        line = raw.strip()
+        rank = _priority(line) if line and line not in seen else None
+        if rank is None:
+            continue
+        seen.add(line)
+        if len(line) > MAX_LINE_CHARS:
+            line = line[: MAX_LINE_CHARS - 1] + "…"
+        candidates.append((rank, position, line))
+
+    remaining = max_chars - len(sources)
+    kept = []
+    for _, position, line in sorted(candidates):
+        if len(line) + 1 > remaining:
+            continue
+        kept.append((position, line))
+        remaining -= len(line) + 1
+    lines = [line for _, line in sorted(kept)]
+    return "\n".join(lines + ([sources] if sources else []))
+
+
+def compact_context(sections: List[Tuple[str, str]], budget_tokens: int) -> str:
+    """
+    Join upstream outputs as crewAI does, replacing each with its digest when
+    the full texts exceed `budget_tokens`. Digests name the task whose full
+    text can be fetched with the full report tool.
+    """
+    full = DIVIDERS.join(text for _, text in sections)
+    if budget_tokens <= 0 or not sections or len(full) <= budget_tokens * 4:
+        return full
+    per_section = budget_tokens // len(sections)
+    parts = []
+    for name, text in sections:
+        title = SECTION_TITLES.get(name, name)
+        parts.append(
+            f"## {title} (digest of {len(text)} characters; for the full text use "
+            f"the '{FULL_REPORT_TOOL_NAME}' tool with task_name=\"{name}\")\n"
+            + digest(text, per_section)
+        )
+    return DIVIDERS.join(parts)
+
+
+class FullReportToolInput(BaseModel):
+    """Input schema for FullReportTool."""
+    task_name: str = Field(..., description="Name of the task whose full report to read, e.g. market_analysis_task")
+
+
+class FullReportTool(BaseTool):
+    name: str = FULL_REPORT_TOOL_NAME
+    description: str = (
+        "Returns the full, uncompacted output of an upstream task when its digest "
+        "is not enough (exact wording, tables, complete citations)."
+    )
+    args_schema: Type[BaseModel] = FullReportToolInput
+    # Called on every use, so reports finished after the tool was created are visible
+    reports: Callable[[], Dict[str, str]]
+
+    def _run(self, task_name: str) -> str:
+        reports = self.reports()
+        if task_name in reports:
+            return reports[task_name]
+        return f"No report named {task_name!r}. Available reports: {', '.join(sorted(reports)) or 'none yet'}"
+
+
+def task_reports(tasks: List[Task]) -> Dict[str, str]:
+    """Full outputs of the finished `tasks`, by task name."""
+    return {task.name: task.output.raw for task in tasks if task.name and task.output is not None}
+
+
+class CompactingCrew(Crew):
+    """Crew that passes budgeted digests of upstream outputs as task context (see context_budget)."""
+
+    def _get_context(self, task: Task, task_outputs: List[TaskOutput]) -> str:
+        budget = context_budget(task.name or "")
+        if not budget or not isinstance(task.context, list) or not task.context:
+            return super()._get_context(task, task_outputs)
+        outputs = [upstream.output for upstream in task.context if upstream.output is not None]
+        # Structured outputs (STRUCTURED_OUTPUTS) are already compact typed fields and are passed whole
+        typed = [model.model_dump_json(exclude_none=True) for model in map(structured_output, outputs) if model is not None]
+        sections = [(output.name or "", output.raw) for output in outputs if structured_output(output) is None]
+        budget = max(budget - sum(len(text) for text in typed) // 4, 1)
+        return DIVIDERS.join(part for part in [*typed, compact_context(sections, budget)] if part)
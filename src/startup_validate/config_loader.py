@@ -0,0 +1,38 @@
+import copy
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Union
+
+CONFIG_DIR = Path(__file__).parent / "config"
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load `.env` once per process, on first use rather than at import."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def _parse_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    import yaml
+
+    # The libyaml loader is several times faster when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def load_yaml(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parse a YAML file once per process (again only if it changes on disk).
+    Callers get their own copy, since crewAI mutates task configs in place.
+    """
+    path = Path(path)
+    return copy.deepcopy(_parse_yaml(str(path.resolve()), path.stat().st_mtime_ns))
+
+
+def load_config(name: str) -> Dict[str, Any]:
+    """Package config by name, e.g. load_config("agents") for config/agents.yaml."""
+    return load_yaml(CONFIG_DIR / f"{name}.yaml")
@@ -1,12 +1,35 @@
-from crewai import Agent, Crew, Process, Task, LLM
-from crewai.project import CrewBase, agent, crew, task
+from crewai import Agent, Crew, CrewOutput, Process, Task
+from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
-from crewai_tools import SerperDevTool
-from dotenv import load_dotenv
-from startup_validate.tools.custom_tool import QuickChartTool
+from crewai.tasks.task_output import TaskOutput
+from typing import Callable, Dict, List, Optional
 import os
-load_dotenv()
+from startup_validate.checkpoint import CheckpointStore
+from startup_validate.compaction import CompactingCrew, FullReportTool, task_reports
+from startup_validate.config_loader import load_env, load_yaml
+from startup_validate.deadline import Deadline
+from startup_validate.llm import get_llm
+from startup_validate.metrics import get_metrics
+from startup_validate.models import TASK_MODELS
+from startup_validate.report import render_report
+from startup_validate.research import pre_research_enabled, research_bundles
+from startup_validate.runlog import enable_run_log
+from startup_validate.tools.chart_store import expand_chart_refs
+from startup_validate.tools.custom_tool import QuickChartBatchTool, QuickChartTool
+from startup_validate.tools.knowledge_search import KnowledgeSearchTool
+
+
+class RestoredCrew(CompactingCrew):
+    """Crew whose tasks were all restored from checkpoints: kickoff returns their outputs without calling an LLM."""
+
+    def kickoff(self, inputs: Optional[dict] = None) -> CrewOutput:
+        outputs = [crew_task.output for crew_task in self.tasks]
+        result = CrewOutput(
+            raw=outputs[-1].raw, pydantic=outputs[-1].pydantic, json_dict=outputs[-1].json_dict, tasks_output=outputs
+        )
+        for callback in self.after_kickoff_callbacks:
+            result = callback(result)
+        return result
 
 
 @CrewBase
@@ -15,15 +38,158 @@ class StartupValidate():
 
     agents: List[BaseAgent]
     tasks: List[Task]
-    
-    # Configure Gemini LLM
-    gemini_llm = LLM(
-        model="gemini/gemini-2.0-flash",
-        api_key=os.getenv("GEMINI_API_KEY"),
-        max_rpm=13,
-        temperature=0,
-        stop=["<stop>"]
-    )
+
+    PROCESSES = ("hierarchical", "dag", "fast")
+
+    def __init__(
+        self,
+        process: Optional[str] = None,
+        startup_idea: Optional[str] = None,
+        resume: bool = False,
+        stream_tokens: bool = False,
+    ):
+        load_env()
+
+        # "hierarchical": the manager plans and delegates every task.
+        # "dag": tasks run in dependency order, with the four specialists in
+        # parallel, and the manager only writes the final report.
+        # "fast": as "dag" but without the planner (one LLM call fewer per run).
+        self.process = process or os.getenv("CREW_PROCESS", "hierarchical")
+        if self.process not in self.PROCESSES:
+            raise ValueError(f"Unknown crew process {self.process!r}, expected one of {self.PROCESSES}")
+
+        # Called with each TaskOutput as soon as its task finishes
+        self.task_callbacks: List[Callable[[TaskOutput], None]] = []
+
+        # Specialists return pydantic models and the final report is rendered from them
+        self.structured = os.getenv("STRUCTURED_OUTPUTS", "false").lower() in ("1", "true", "yes")
+        self.startup_idea = None
+        self.checkpoints = None
+        self.resume = False
+        if startup_idea or resume:
+            self.bind_idea(startup_idea, resume)
+
+        # Tasks go straight to their `agent:` from tasks.yaml instead of through the manager
+        self.direct_delegation = self.process in ("dag", "fast")
+
+        # RUN_DEADLINE seconds for the whole run, split into per-task budgets (startup_validate.deadline)
+        run_deadline = float(os.getenv("RUN_DEADLINE", "0"))
+        self.deadline = Deadline(run_deadline, parallel_research=self.direct_delegation) if run_deadline > 0 else None
+        if self.deadline is not None:
+            self.task_callbacks.append(self.deadline.task_finished)
+
+        # The manager streams its tokens so the final report can be shown as it is written
+        self.manager_llm = get_llm(stream=stream_tokens, agent="startup_validation_manager")
+
+    @property
+    def gemini_llm(self):
+        """Shared LLM of the default tier, built on first use; request/token rates are enforced by startup_validate.rate_limit."""
+        return get_llm()
+
+    def agent_llm(self, agent_name: str):
+        """LLM of the model tier config/models.yaml assigns to `agent_name`."""
+        return get_llm(agent=agent_name)
+
+    def bind_idea(self, startup_idea: Optional[str], resume: bool = False) -> None:
+        """
+        Set the idea this instance validates. The service builds crews before
+        their job arrives and binds the idea afterwards; resume must be bound
+        before crew() is called, since that is when checkpoints are restored.
+        """
+        if not startup_idea:
+            raise ValueError("resume=True needs the startup_idea whose checkpoints to load")
+        if self.checkpoints is not None:
+            raise ValueError(f"Already bound to {self.startup_idea!r}")
+        self.startup_idea = startup_idea
+        # With a startup idea, every finished task is checkpointed; resume skips those tasks
+        self.checkpoints = CheckpointStore(startup_idea)
+        self.resume = resume
+        self.task_callbacks.append(self.checkpoints.save)
+
+    def release(self) -> None:
+        """
+        Drop this instance from crewAI's memo caches once its run is over.
+        @agent, @task and @crew results are memoized in module-level dicts
+        keyed by the instance, so without this no instance (nor its agents,
+        tasks and outputs) is ever freed in a long-running process.
+        """
+        # crewAI's event listener also keeps every task it has traced as a key of its span dict
+        from crewai.events.event_listener import event_listener
+
+        for crew_task in getattr(self, "tasks", None) or []:
+            event_listener.execution_spans.pop(crew_task, None)
+        for klass in type(self).__mro__:
+            for method in vars(klass).values():
+                code = getattr(method, "__code__", None)
+                if code is None or "cache" not in code.co_freevars:
+                    continue
+                cache = method.__closure__[code.co_freevars.index("cache")].cell_contents
+                for key in [key for key in list(cache) if key[0] and key[0][0] is self]:
+                    cache.pop(key, None)
+
+    def search_tool(self):
+        # crewai_tools is a large import, so it is deferred until an agent is built
+        from startup_validate.tools.cached_search import CachedSerperDevTool
+
+        return CachedSerperDevTool()
+
+    def research_tools(self) -> list:
+        """Specialist tools: the local knowledge index first (unless KNOWLEDGE_SEARCH=false), then web search."""
+        if os.getenv("KNOWLEDGE_SEARCH", "true").lower() in ("1", "true", "yes"):
+            return [KnowledgeSearchTool(), self.search_tool()]
+        return [self.search_tool()]
+
+    def _task_completed(self, output: TaskOutput) -> None:
+        for callback in self.task_callbacks:
+            callback(output)
+
+    def _restore_checkpoints(self, tasks: List[Task]) -> List[Task]:
+        """Attach stored outputs to completed tasks and return the tasks still to run (none if all completed)."""
+        completed = self.checkpoints.completed()
+        pending = []
+        for crew_task in tasks:
+            if crew_task.name in completed:
+                # Downstream tasks read context from task.output
+                crew_task.output = completed[crew_task.name]
+            else:
+                pending.append(crew_task)
+        return pending
+
+
+    @before_kickoff
+    def start_deadline(self, inputs):
+        if self.deadline is not None:
+            self.deadline.start()
+        return inputs
+
+    @before_kickoff
+    def pre_research(self, inputs):
+        """
+        Fetch the specialists' likely searches in one concurrent burst
+        (startup_validate.research) and add each task's results to its
+        description. Tasks restored from checkpoints are skipped.
+        """
+        pending = [crew_task for crew_task in self.specialist_tasks() if crew_task.output is None]
+        if pending and inputs.get("startup_idea") and pre_research_enabled():
+            bundles = research_bundles(inputs["startup_idea"], [crew_task.name for crew_task in pending])
+            for crew_task in pending:
+                if bundles.get(crew_task.name):
+                    crew_task.description = f"{crew_task.description}\n\n{bundles[crew_task.name]}"
+        return inputs
+
+    @after_kickoff
+    def record_deadline(self, output: CrewOutput) -> CrewOutput:
+        if self.deadline is not None:
+            self.deadline.close()
+            get_metrics().record_budgets(self.startup_idea or "run", self.deadline.report())
+        return output
+
+    @after_kickoff
+    def expire_checkpoints(self, output: CrewOutput) -> CrewOutput:
+        # The run is complete, so a later --resume of this idea starts over instead of reusing it
+        if self.checkpoints is not None:
+            self.checkpoints.finish()
+        return output
 
 
     @agent
@@ -31,8 +197,8 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['market_analyst'], # type: ignore[index]
             verbose=True,
-            tools=[SerperDevTool()],
-            llm=self.gemini_llm,
+            tools=self.research_tools(),
+            llm=self.agent_llm('market_analyst'),
             respect_context_window=True,
             inject_date=True
         )
@@ -42,9 +208,9 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['competitive_researcher'], # type: ignore[index]
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=self.research_tools(),
             max_retry_limit=3 ,
-            llm=self.gemini_llm,
+            llm=self.agent_llm('competitive_researcher'),
             respect_context_window=True,
             inject_date=True
         )
@@ -54,9 +220,9 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['business_model_analyst'], # type: ignore[index]
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=self.research_tools(),
             max_retry_limit=3 ,
-            llm=self.gemini_llm,
+            llm=self.agent_llm('business_model_analyst'),
             respect_context_window=True,
             inject_date=True
         )
@@ -66,9 +232,9 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['funding_analyst'], # type: ignore[index]
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=self.research_tools(),
             max_retry_limit=3 ,
-            llm=self.gemini_llm,
+            llm=self.agent_llm('funding_analyst'),
             respect_context_window=True,
             inject_date=True
         )
@@ -78,9 +244,9 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['validation_scorer'], # type: ignore[index]
             verbose=True,
-            tools=[SerperDevTool(), QuickChartTool()],
+            tools=[self.search_tool(), QuickChartTool(), QuickChartBatchTool(), self.full_report_tool()],
             max_retry_limit=3 ,
-            llm=self.gemini_llm,
+            llm=self.agent_llm('validation_scorer'),
             respect_context_window=True,
             inject_date=True
         )
@@ -90,7 +256,9 @@ class StartupValidate():
         return Agent(
             config=self.agents_config['startup_validation_manager'], # type: ignore[index]
             verbose=True,
-            llm=self.gemini_llm,
+            llm=self.manager_llm,
+            # A hierarchical manager may only hold delegation tools
+            tools=[] if self.process == "hierarchical" else [self.full_report_tool()],
             respect_context_window=True,
             inject_date=True,
             # output_file='output/startup_validation_report.md'
@@ -104,39 +272,44 @@ class StartupValidate():
     def market_analysis_task(self) -> Task:
         return Task(
             config=self.tasks_config['market_analysis_task'], # type: ignore[index]
-            context=[self.tasks_config['competitive_analysis_task'], self.tasks_config['funding_analysis_task'], self.tasks_config['validation_scoring_task'] , self.tasks_config['business_model_task'],self.tasks_config['manager_report_task']]
+            output_pydantic=self.output_model('market_analysis_task'),
+            context=[],
+            async_execution=self.direct_delegation
         )
 
     @task
     def competitive_analysis_task(self) -> Task:
         return Task(
             config=self.tasks_config['competitive_analysis_task'], # type: ignore[index]
-            context=[self.tasks_config['market_analysis_task'], self.tasks_config['funding_analysis_task'], self.tasks_config['validation_scoring_task'] , self.tasks_config['business_model_task'],self.tasks_config['manager_report_task']]
-
+            output_pydantic=self.output_model('competitive_analysis_task'),
+            context=[],
+            async_execution=self.direct_delegation
         )
 
     @task
     def business_model_task(self) -> Task:
         return Task(
             config=self.tasks_config['business_model_task'], # type: ignore[index]
-            context=[self.tasks_config['market_analysis_task'], self.tasks_config['funding_analysis_task'], self.tasks_config['validation_scoring_task'] , self.tasks_config['competitive_analysis_task'],self.tasks_config['manager_report_task']]
-
+            output_pydantic=self.output_model('business_model_task'),
+            context=[],
+            async_execution=self.direct_delegation
         )
 
     @task
     def funding_analysis_task(self) -> Task:
         return Task(
             config=self.tasks_config['funding_analysis_task'], # type: ignore[index]
-            context=[self.tasks_config['market_analysis_task'], self.tasks_config['business_model_task'], self.tasks_config['validation_scoring_task'] , self.tasks_config['competitive_analysis_task'],self.tasks_config['manager_report_task']]
-
+            output_pydantic=self.output_model('funding_analysis_task'),
+            context=[],
+            async_execution=self.direct_delegation
         )
 
     @task
     def validation_scoring_task(self) -> Task:
         return Task(
             config=self.tasks_config['validation_scoring_task'], # type: ignore[index]
-            context=[self.tasks_config['market_analysis_task'], self.tasks_config['business_model_task'], self.tasks_config['funding_analysis_task'] , self.tasks_config['competitive_analysis_task'],self.tasks_config['manager_report_task']]
-
+            output_pydantic=self.output_model('validation_scoring_task'),
+            context=self.specialist_tasks()
             # output_file='startup_validation_report.md'
         )
 
@@ -145,15 +318,44 @@ class StartupValidate():
     def manager_report_task(self) -> Task:
         return Task(
             config=self.tasks_config['manager_report_task'], # type: ignore[index]
-            context=[
-                self.tasks_config['market_analysis_task'],
-                self.tasks_config['competitive_analysis_task'],
-                self.tasks_config['business_model_task'],
-                self.tasks_config['funding_analysis_task'],
-                self.tasks_config['validation_scoring_task']
-            ]
+            output_pydantic=self.output_model('manager_report_task'),
+            # With structured outputs the manager only writes the executive summary; the rest is rendered
+            description=self.tasks_config['manager_report_task']['structured_description'] if self.structured else None,
+            expected_output=self.tasks_config['manager_report_task']['structured_expected_output'] if self.structured else None,
+            context=[*self.specialist_tasks(), self.validation_scoring_task()]
         )
 
+    def output_model(self, task_name: str):
+        """output_pydantic model for `task_name` when structured outputs are enabled."""
+        return TASK_MODELS[task_name] if self.structured else None
+
+    def final_report(self, result: CrewOutput) -> str:
+        """
+        The final markdown: rendered from structured task outputs, or the
+        manager's report. chart:<id> references become <img> tags here.
+        """
+        if not self.structured:
+            return expand_chart_refs(result.raw)
+        return expand_chart_refs(render_report(self.startup_idea or "", self.task_outputs()))
+
+    def task_outputs(self) -> Dict[str, TaskOutput]:
+        """Outputs of the tasks that have run or were restored, by task name."""
+        tasks = [*self.specialist_tasks(), self.validation_scoring_task(), self.manager_report_task()]
+        return {crew_task.name: crew_task.output for crew_task in tasks if crew_task.output}
+
+    def full_report_tool(self) -> FullReportTool:
+        """Full text of upstream outputs, which downstream tasks receive only as digests."""
+        return FullReportTool(reports=lambda: task_reports([*self.specialist_tasks(), self.validation_scoring_task()]))
+
+    def specialist_tasks(self) -> List[Task]:
+        """The four research tasks; they depend on nothing and can run concurrently."""
+        return [
+            self.market_analysis_task(),
+            self.competitive_analysis_task(),
+            self.business_model_task(),
+            self.funding_analysis_task(),
+        ]
+
 
     @crew
     def crew(self) -> Crew:
@@ -161,25 +363,49 @@ class StartupValidate():
         # To learn how to add knowledge sources to your crew, check out the documentation:
         # https://docs.crewai.com/concepts/knowledge#what-is-knowledge
 
-        return Crew(
-            agents=[self.market_analyst(), self.competitive_researcher(), self.business_model_analyst(), self.funding_analyst(), self.validation_scorer()],
-            tasks=[
-                self.market_analysis_task(),
-                self.competitive_analysis_task(),
-                self.business_model_task(),
-                self.funding_analysis_task(),
-                self.validation_scoring_task(),
-                self.manager_report_task()
-            ],
-            manager_agent=self.startup_validation_manager(),
-            manager_llm=self.gemini_llm,
-            process=Process.hierarchical,
+        agents = [self.market_analyst(), self.competitive_researcher(), self.business_model_analyst(), self.funding_analyst(), self.validation_scorer()]
+        tasks = [*self.specialist_tasks(), self.validation_scoring_task(), self.manager_report_task()]
+        crew_class = CompactingCrew
+        if self.resume:
+            pending = self._restore_checkpoints(tasks)
+            if pending:
+                tasks = pending
+            else:
+                # Every task, the final report included, finished in an earlier run
+                crew_class = RestoredCrew
+        if self.deadline is not None:
+            self.deadline.register(tasks)
+
+        if self.direct_delegation:
+            # Specialists run concurrently, scoring waits for them, the manager report waits for scoring
+            process_args = dict(
+                agents=[*agents, self.startup_validation_manager()],
+                process=Process.sequential,
+            )
+        else:
+            process_args = dict(
+                agents=agents,
+                manager_agent=self.startup_validation_manager(),
+                manager_llm=self.manager_llm,
+                process=Process.hierarchical,
+            )
+
+        # "jsonl" (default): compact structured log under RUN_LOG_DIR; "text": crewAI's logs.txt
+        run_log = os.getenv("RUN_LOG", "jsonl")
+        if run_log == "jsonl":
+            enable_run_log()
+
+        # Downstream tasks get budgeted digests of upstream outputs (see startup_validate.compaction)
+        return crew_class(
+            tasks=tasks,
+            **process_args,
+            task_callback=self._task_completed,
             verbose=True,
             # memory=True,
-            max_rpm=13,
-            planning=True,
-            planning_llm=self.gemini_llm,
-            output_log_file = True,
+            # The planner adds an LLM call per run and restates every task plan in the prompts
+            planning=self.process != "fast",
+            planning_llm=self.agent_llm('planner'),
+            output_log_file = run_log == "text",
             llm=self.gemini_llm,
             # embedder={
             #     "provider": "google-generativeai",
@@ -189,3 +415,7 @@ class StartupValidate():
             #     }
             # }
         )
+
+
+# crewAI re-reads both YAML files for every crew instance; parse them once per process instead
+StartupValidate.load_yaml = staticmethod(load_yaml)
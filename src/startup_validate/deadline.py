@@ -0,0 +1,244 @@
+"""
+Run-level deadline split into per-task time budgets.
+
+RUN_DEADLINE seconds are divided between the research, scoring and report
+phases (PHASE_SHARES). A phase's share is computed from the time left when it
+starts, so time saved by earlier phases goes to later ones. The budget is
+enforced in the LLM and search tool calls of the task (startup_validate.router
+and the search tool):
+
+- once a task's budget is spent, its next LLM call carries an instruction to
+  stop using tools and give the best Final Answer it can now;
+- searches are refused with a message saying the same;
+- a request never runs past the grace period (GRACE_RATIO of the budget):
+  LLM and search timeouts are capped at the time left until it ends;
+- past the grace period, the LLM is not called at all and the task ends with
+  a partial answer built from its tool results so far.
+
+Budget use per task is recorded in the run's metrics.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+PHASE_SHARES = {"research": 0.55, "scoring": 0.2, "report": 0.25}
+PHASE_TASKS = {
+    "research": ("market_analysis_task", "competitive_analysis_task", "business_model_task", "funding_analysis_task"),
+    "scoring": ("validation_scoring_task",),
+    "report": ("manager_report_task",),
+}
+GRACE_RATIO = 0.2
+# Shortest timeout given to a request, so that the wrap-up call still has a chance to answer
+MIN_CALL_TIMEOUT = 1.0
+WRAP_UP_MESSAGE = (
+    "The time budget for this task is used up. Do not call any more tools. "
+    "Give your best Final Answer now, based on what you have found so far, "
+    "and note which parts are incomplete."
+)
+TOOL_STOP_MESSAGE = "Search skipped: the time budget for this task is used up. Give your Final Answer now."
+
+# Budgets by task id, and the budget whose task is running on each thread
+_budgets: Dict[str, "TaskBudget"] = {}
+_budgets_lock = threading.Lock()
+_current = threading.local()
+
+
+class TaskBudget:
+    """Time budget of one task; the clock starts at the task's first LLM call."""
+
+    def __init__(self, deadline: "Deadline", name: str):
+        self.deadline = deadline
+        self.name = name
+        self.seconds: Optional[float] = None
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.wrap_ups = 0
+        self.forced_answers = 0
+        self.refused_tool_calls = 0
+
+    def start(self) -> None:
+        if self.started is None:
+            self.seconds = self.deadline.allot(self.name)
+            self.started = time.monotonic()
+
+    def used(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def exhausted(self) -> bool:
+        return self.started is not None and self.used() >= self.seconds
+
+    def overdue(self) -> bool:
+        """Past the budget plus its grace period for the wrap-up answer."""
+        return self.started is not None and self.time_left() <= 0
+
+    def time_left(self) -> float:
+        """Seconds until the grace period ends (the budget's hard limit)."""
+        if self.started is None:
+            return float("inf")
+        return self.seconds * (1 + GRACE_RATIO) - self.used()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "budget_s": round(self.seconds or 0.0, 2),
+            "used_s": round(self.used(), 2),
+            "used_ratio": round(self.used() / self.seconds, 3) if self.seconds else 0.0,
+            "exhausted": self.exhausted(),
+            "wrap_ups": self.wrap_ups,
+            "forced_answers": self.forced_answers,
+            "refused_tool_calls": self.refused_tool_calls,
+        }
+
+
+class Deadline:
+    """
+    A run's deadline. With `parallel_research` the four research tasks run
+    at the same time and each gets the whole research phase; otherwise they
+    share it.
+    """
+
+    def __init__(self, seconds: float, parallel_research: bool = True):
+        if seconds <= 0:
+            raise ValueError("deadline seconds must be positive")
+        self.seconds = seconds
+        self.parallel_research = parallel_research
+        self.started: Optional[float] = None
+        self._phase_budgets: Dict[str, float] = {}
+        # Phases with tasks to run; tasks restored from checkpoints leave theirs out
+        self._phases = set(PHASE_SHARES)
+        self._lock = threading.Lock()
+        self.budgets: Dict[str, TaskBudget] = {}
+
+    def start(self) -> None:
+        """Start the run clock (at kickoff)."""
+        self.started = time.monotonic()
+        # Worker threads run one job after another; drop the previous job's budget
+        _current.budget = None
+
+    def close(self) -> None:
+        """Forget the task registrations once the run is over."""
+        with _budgets_lock:
+            for task_id in [key for key, budget in _budgets.items() if budget.deadline is self]:
+                del _budgets[task_id]
+
+    def remaining(self) -> float:
+        if self.started is None:
+            return self.seconds
+        return max(0.0, self.seconds - (time.monotonic() - self.started))
+
+    def allot(self, task_name: str) -> float:
+        """Seconds for `task_name`, from its phase's share of the time left."""
+        phase = next((p for p, names in PHASE_TASKS.items() if task_name in names), None)
+        with self._lock:
+            if phase is None:
+                # A task outside the phases gets whatever is left of the run
+                return self.remaining()
+            if phase not in self._phase_budgets:
+                pending = [p for p in PHASE_SHARES if (p in self._phases or p == phase) and p not in self._phase_budgets]
+                share = PHASE_SHARES[phase] / sum(PHASE_SHARES[p] for p in pending)
+                self._phase_budgets[phase] = self.remaining() * share
+            budget = self._phase_budgets[phase]
+        if phase == "research" and not self.parallel_research:
+            budget /= len(PHASE_TASKS["research"])
+        return budget
+
+    def register(self, tasks: List[Any]) -> None:
+        """
+        Give each task a budget, found again from the task in LLM calls. Only
+        the phases of `tasks` share the run's time: when the research tasks
+        were restored from checkpoints, scoring and the report split it all.
+        """
+        names = {task.name for task in tasks}
+        with self._lock:
+            self._phases = {phase for phase, phase_tasks in PHASE_TASKS.items() if names.intersection(phase_tasks)}
+        with _budgets_lock:
+            for task in tasks:
+                budget = self.budgets.setdefault(task.name, TaskBudget(self, task.name))
+                _budgets[str(task.id)] = budget
+
+    def task_finished(self, output: Any) -> None:
+        """Stop the clock of a finished task (usable as a task callback)."""
+        budget = self.budgets.get(getattr(output, "name", None) or "")
+        if budget is not None and budget.finished is None:
+            budget.finished = time.monotonic()
+
+    def report(self) -> Dict[str, Any]:
+        used = time.monotonic() - self.started if self.started is not None else 0.0
+        return {
+            "deadline_s": self.seconds,
+            "used_s": round(used, 2),
+            "tasks": {name: budget.report() for name, budget in self.budgets.items() if budget.started is not None},
+        }
+
+
+def enter_task(task: Any) -> Optional[TaskBudget]:
+    """
+    The budget for an LLM call made for `task`, which then becomes the
+    thread's current budget. Calls for unregistered tasks (e.g. work delegated
+    by the manager) count against the budget already running on the thread.
+    """
+    with _budgets_lock:
+        budget = _budgets.get(str(getattr(task, "id", "")))
+    if budget is None:
+        return getattr(_current, "budget", None)
+    _current.budget = budget
+    budget.start()
+    return budget
+
+
+def current_budget() -> Optional[TaskBudget]:
+    """Budget of the task running on this thread, if any."""
+    return getattr(_current, "budget", None)
+
+
+def call_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    Timeout for a request made on this thread: `timeout`, capped at the time
+    left in the running task's budget and grace period.
+    """
+    budget = current_budget()
+    if budget is None or budget.started is None:
+        return timeout
+    left = max(budget.time_left(), MIN_CALL_TIMEOUT)
+    return left if timeout is None else min(timeout, left)
+
+
+def force_answer(budget: TaskBudget, messages: Any) -> str:
+    """End an overdue task with a partial answer instead of another LLM call."""
+    budget.forced_answers += 1
+    return _partial_answer(messages)
+
+
+def _partial_answer(messages: Any) -> str:
+    """Final answer assembled from the tool results in the conversation so far."""
+    # Agents append each tool result to their own turn as "Observation: ..."
+    observations = [
+        message["content"].split("Observation:", 1)[1].strip() for message in messages or []
+        if isinstance(message, dict) and message.get("role") == "assistant"
+        and "Observation:" in (message.get("content") or "")
+    ]
+    findings = "\n\n".join(observations[-3:])[-4000:] or "No findings were collected."
+    return (
+        "Thought: The time budget for this task is used up.\n"
+        "Final Answer: Partial result (the time budget ran out before the analysis was complete).\n\n"
+        f"{findings}"
+    )
+
+
+def apply_deadline(messages: Any, from_task: Any) -> tuple:
+    """
+    Budget checks before an LLM call. Returns the messages to send (with a
+    wrap-up instruction once the budget is spent) and, past the grace
+    period, a partial final answer to return instead of calling the LLM.
+    """
+    budget = enter_task(from_task)
+    if budget is None or not budget.exhausted() or not isinstance(messages, list):
+        return messages, None
+    if budget.overdue():
+        return messages, force_answer(budget, messages)
+    last = messages[-1] if messages else {}
+    if isinstance(last, dict) and last.get("content") == WRAP_UP_MESSAGE:
+        return messages, None
+    budget.wrap_ups += 1
+    return [*messages, {"role": "user", "content": WRAP_UP_MESSAGE}], None
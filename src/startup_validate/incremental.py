@@ -0,0 +1,111 @@
+"""
+Incremental re-validation of an edited idea.
+
+The edited idea is diffed word by word against a stored prior run. Each
+changed span is mapped to the specialist analyses it affects through keyword
+stems (TASK_KEYWORDS): a pricing change affects only business_model_task, a
+new investor angle only funding_analysis_task. Only the affected specialists
+run again; the other outputs are reused from the prior run, and scoring and
+the final report are always rebuilt from the mix.
+
+A changed span is attributed to the tasks of the keywords in it, so
+"with usage-based pricing" affects the business model even though "usage"
+and "based" say nothing alone. The mapping errs towards re-running: a span
+with no keyword at all ("job candidates" -> "recruiters") is taken to change
+the product itself, which affects every analysis.
+"""
+import difflib
+import re
+from typing import Dict, List, Tuple
+
+SPECIALIST_TASKS = ("market_analysis_task", "competitive_analysis_task", "business_model_task", "funding_analysis_task")
+
+# Stems of at least four letters match as prefixes ("pric" matches "priced", "pricing"); shorter ones match whole words
+TASK_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "market_analysis_task": (
+        "market", "customer", "user", "client", "segment", "audience", "consumer", "buyer", "demand",
+        "enterprise", "smb", "smbs", "sme", "smes", "small", "medium", "mid", "large", "b2b", "b2c",
+        "global", "worldwide", "international", "local", "region", "country", "countr", "city", "cities",
+        "urban", "rural", "europ", "asia", "africa", "latam", "america", "us", "usa", "uk", "india",
+        "niche", "vertical", "tam", "sam", "som",
+    ),
+    "competitive_analysis_task": (
+        "competi", "rival", "alternative", "incumbent", "differentiat", "unlike", "replac", "moat",
+        "patent", "proprietar", "unique", "better", "faster", "cheaper", "first",
+    ),
+    "business_model_task": (
+        "pric", "cost", "cheap", "fee", "commission", "subscri", "freemium", "free", "trial", "paid",
+        "pay", "revenue", "monetiz", "monetis", "licens", "margin", "upsell", "discount", "tier", "plan",
+        "seat", "per", "month", "annual", "year", "week", "usage", "transaction", "advertis", "ads",
+        "saas", "contract", "resell", "wholesale", "retail", "usd", "dollar", "eur", "euro",
+        # Who pays shapes the model as much as what they pay
+        "enterprise", "smb", "smbs", "b2b", "b2c",
+    ),
+    "funding_analysis_task": (
+        "fund", "invest", "raise", "raising", "seed", "series", "vc", "vcs", "angel", "grant",
+        "bootstrap", "valuation", "runway", "capital", "round", "equity", "accelerator", "incubator",
+    ),
+}
+
+# Words that carry no meaning of their own; a span changing only these inherits its neighbours' tasks
+FILLER_WORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the this to via was "
+    "were will with who which their our your they them we".split()
+)
+CONTEXT_WORDS = 3
+
+
+def words(startup_idea: str) -> List[str]:
+    """
+    Lower-case words of an idea, without surrounding punctuation ("seat."
+    and "seat" are the same word); amounts such as "$49", "12.5" and "18%"
+    are kept whole.
+    """
+    return re.findall(r"[$€£]?\d+(?:[.,]\d+)*%?|\w+", startup_idea.casefold())
+
+
+def keyword_tasks(word: str) -> List[str]:
+    """Specialist tasks whose keywords match `word`."""
+    return [
+        task for task, stems in TASK_KEYWORDS.items()
+        if any(word == stem or (len(stem) >= 4 and word.startswith(stem)) for stem in stems)
+    ]
+
+
+def _is_filler(word: str) -> bool:
+    # Numbers, amounts and percentages mean nothing without the words around them
+    return word in FILLER_WORDS or not re.search(r"[^\W\d_]", word)
+
+
+def idea_changes(prior_idea: str, startup_idea: str) -> List[Dict[str, List[str]]]:
+    """
+    Changed spans between two ideas: the `removed` and `added` words of each,
+    and the unchanged `context` words around it in the new idea.
+    """
+    old, new = words(prior_idea), words(startup_idea)
+    changes = []
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(a=old, b=new, autojunk=False).get_opcodes():
+        if op == "equal":
+            continue
+        changes.append({
+            "removed": old[i1:i2],
+            "added": new[j1:j2],
+            "context": new[max(0, j1 - CONTEXT_WORDS):j1] + new[j2:j2 + CONTEXT_WORDS],
+        })
+    return changes
+
+
+def affected_tasks(prior_idea: str, startup_idea: str) -> List[str]:
+    """Specialist tasks whose analysis an edit from `prior_idea` to `startup_idea` invalidates."""
+    affected = set()
+    for change in idea_changes(prior_idea, startup_idea):
+        changed = [word for word in change["removed"] + change["added"] if not _is_filler(word)]
+        matched = {task for word in changed for task in keyword_tasks(word)}
+        if not changed:
+            # Only numbers or filler changed ("$49" -> "$99"): the words around them say what they were about
+            matched = {task for word in change["context"] for task in keyword_tasks(word)}
+        if not matched:
+            # Nothing in or around the span is claimed by an analysis: the product itself changed
+            return list(SPECIALIST_TASKS)
+        affected |= matched
+    return [task for task in SPECIALIST_TASKS if task in affected]
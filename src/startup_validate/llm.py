@@ -0,0 +1,158 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from crewai import LLM
+
+from startup_validate.cache import SQLiteCache
+from startup_validate.config_loader import load_env
+from startup_validate.rate_limit import estimate_tokens, get_rate_limiter
+
+
+class CompletionCache:
+    """Persistent cache of LLM completions with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 2000):
+        self.store = SQLiteCache("llm_completions", max_entries=max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, messages: Any, stop: List[str], temperature: Optional[float]) -> str:
+        payload = {"model": model, "messages": messages, "stop": stop, "temperature": temperature}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.store.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self.store),
+        }
+
+
+_completion_cache: Optional[CompletionCache] = None
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """The shared completion cache, or None unless LLM_CACHE is enabled."""
+    global _completion_cache
+    if os.getenv("LLM_CACHE", "false").lower() not in ("1", "true", "yes"):
+        return None
+    if _completion_cache is None:
+        _completion_cache = CompletionCache(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+        )
+    return _completion_cache
+
+
+# Request parameters set for one call only (stop words, timeout, retries); LLM instances are shared across threads
+_call_params: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("llm_call_params", default={})
+
+
+class StartupValidateLLM(LLM):
+    """
+    LLM whose calls all draw from the process-wide rate limiter.
+
+    With LLM_CACHE enabled, deterministic text completions (temperature 0, no
+    native tool calling) are served from the persistent completion cache.
+    `stop`, `timeout` and `max_retries` given to call() apply to that request only.
+    """
+
+    def _prepare_completion_params(self, messages: Any, tools: Optional[List[dict]] = None) -> Dict[str, Any]:
+        return {**super()._prepare_completion_params(messages, tools), **_call_params.get()}
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+        stop: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> Any:
+        cache = get_completion_cache()
+        cache_key = None
+        if cache is not None and self.temperature == 0 and not tools and not available_functions:
+            cache_key = cache.key(self.model, messages, stop if stop is not None else self.stop, self.temperature)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        overrides = {
+            name: value for name, value in (("stop", stop), ("timeout", timeout), ("max_retries", max_retries))
+            if value is not None
+        }
+        limiter = get_rate_limiter()
+        limiter.acquire(estimate_tokens(messages))
+        token = _call_params.set(overrides)
+        try:
+            response = super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+        finally:
+            _call_params.reset(token)
+        limiter.record(estimate_tokens(response))
+
+        if cache_key is not None and isinstance(response, str) and response:
+            cache.set(cache_key, response)
+        return response
+
+
+_routed_llms: Dict[tuple, LLM] = {}
+_llm_override: Optional[LLM] = None
+_routed_llms_lock = threading.Lock()
+
+
+def get_llm(stream: bool = False, agent: Optional[str] = None) -> LLM:
+    """
+    LLM for `agent`'s model tier in config/models.yaml (the default tier
+    without an agent), shared by every crew in the process so they all draw
+    from the same rate limiter. `stream=True` emits tokens as
+    LLMStreamChunkEvents while they arrive.
+    """
+    if _llm_override is not None:
+        return _llm_override
+    load_env()
+    from startup_validate.router import RoutedLLM, get_router
+
+    router = get_router()
+    tier = router.tier_for(agent)
+    with _routed_llms_lock:
+        if (tier, stream) not in _routed_llms:
+            _routed_llms[tier, stream] = RoutedLLM(router, tier, stream=stream)
+        return _routed_llms[tier, stream]
+
+
+def override_llm(llm: LLM) -> None:
+    """
+    Make get_llm() return `llm` for every agent and setting (offline benchmarks and tests).
+    Crews and flows look the LLM up when they build their agents, so call this before that.
+    """
+    global _llm_override
+    _llm_override = llm
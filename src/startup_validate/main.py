@@ -1,10 +1,17 @@
 #!/usr/bin/env python
+import os
 import sys
 import warnings
 
 from datetime import datetime
 
+from startup_validate import batch
+from startup_validate.config_loader import load_env
 from startup_validate.crew import StartupValidate
+from startup_validate.llm import get_completion_cache
+from startup_validate.metrics import get_metrics
+from startup_validate.report import StreamingReportWriter, stream_tokens_to_stdout
+from startup_validate.results import remember_results, reuse_results
 
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
@@ -14,23 +21,83 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 # Replace with inputs you want to test with, it will automatically
 # interpolate any tasks and agents information
 
+def report_cache_stats():
+    """
+    Print LLM completion cache statistics when LLM_CACHE is enabled.
+    """
+    cache = get_completion_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit rate {stats['hit_rate']:.0%}, {stats['entries']} entries)")
+
+
 def run():
     """
     Run the crew.
+    Pass --resume to skip tasks already checkpointed for this idea and reuse their outputs.
+    Pass --stream to append each task's output to res.md as soon as it finishes
+    (and --stream-tokens to also print the final report while it is generated);
+    the streamed file is replaced by the full report once the run ends.
     """
     inputs = {
         'startup_idea': 'AI interviewer that evaluates job candidates via simulated work scenarios and outputs ranked shortlists'
     }
+    stream = "--stream" in sys.argv
+    stream_tokens = "--stream-tokens" in sys.argv
     
     try:
-        res = StartupValidate().crew().kickoff(inputs=inputs)
+        # With RESULT_CACHE, a repeated idea is answered from (or seeded by) a stored run
+        report, seeded = reuse_results(inputs['startup_idea'])
+        if report is not None:
+            with open("res.md", "w") as f:
+                f.write(report)
+            print("Result saved to res.md")
+            return
+
+        crew_base = StartupValidate(
+            startup_idea=inputs['startup_idea'],
+            resume="--resume" in sys.argv or seeded,
+            stream_tokens=stream_tokens,
+        )
+        if stream:
+            crew_base.task_callbacks.append(StreamingReportWriter("res.md", inputs['startup_idea']))
+        if stream_tokens:
+            stream_tokens_to_stdout()
+        metrics = get_metrics()
+
+        res = crew_base.crew().kickoff(inputs=inputs)
+        report = crew_base.final_report(res)
+        remember_results(inputs['startup_idea'], report, crew_base.task_outputs())
+        # A streamed res.md lacks restored sections, so the rendered report replaces it
         with open("res.md", "w") as f:
-            f.write(res.raw)
+            f.write(report)
         print(f"Result saved to res.md")
+        report_cache_stats()
+        print(metrics.summary_table())
+        print(f"Metrics saved to {metrics.write_json(os.getenv('METRICS_FILE', 'logs/metrics.json'))}")
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
+def run_batch():
+    """
+    Run the crew for every startup idea in a JSONL or CSV file.
+    Usage: run_batch <ideas_file> [output_dir] [concurrency] [--resume]
+    """
+    load_env()
+    args = [arg for arg in sys.argv[1:] if arg != "--resume"]
+    output_dir = args[1] if len(args) > 1 else "batch_output"
+    concurrency = int(args[2]) if len(args) > 2 else int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+    try:
+        entries = batch.run_batch(args[0], output_dir=output_dir, concurrency=concurrency, resume="--resume" in sys.argv)
+        failed = sum(1 for entry in entries if entry["status"] != "completed")
+        print(f"Validated {len(entries) - failed}/{len(entries)} ideas, index saved to {output_dir}/index.md")
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+
+
 def train():
     """
     Train the crew for a given number of iterations.
@@ -40,6 +107,7 @@ def train():
     }
     try:
         StartupValidate().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        report_cache_stats()
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -50,6 +118,7 @@ def replay():
     """
     try:
         StartupValidate().crew().replay(task_id=sys.argv[1])
+        report_cache_stats()
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
@@ -64,6 +133,7 @@ def test():
     
     try:
         StartupValidate().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        report_cache_stats()
 
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai.events import (
+    BaseEventListener,
+    CrewKickoffCompletedEvent,
+    CrewKickoffFailedEvent,
+    CrewKickoffStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+)
+
+from startup_validate.rate_limit import estimate_tokens
+
+PLANNER_ROLE = "Task Execution Planner"
+COUNTERS = ("wall_s", "llm_calls", "llm_s", "prompt_tokens", "completion_tokens", "tool_calls", "tool_s", "tool_errors")
+
+
+def _label(text: Optional[str], limit: int = 48) -> str:
+    """Short single-line label (delegated tasks are named by their full description)."""
+    text = " ".join((text or "unknown").split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class SpanExporter:
+    """Writes OpenTelemetry-shaped spans as JSON lines to a local file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(span, default=str) + "\n")
+
+
+class MetricsCollector(BaseEventListener):
+    """
+    Aggregates wall time, LLM calls and latency, prompt/completion tokens and
+    tool calls and latency per task and per agent from crewAI events.
+
+    Token counts are estimates (~4 characters per token), as in the rate limiter.
+    """
+
+    def __init__(self, span_exporter: Optional[SpanExporter] = None):
+        self.span_exporter = span_exporter
+        self._lock = threading.Lock()
+        self.reset()
+        super().__init__()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.by_task: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+            self.by_agent: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+            self.crew_wall_s = 0.0
+            # Deadline reports by run (startup_validate.deadline), when RUN_DEADLINE is set
+            self.budgets: Dict[str, Dict[str, Any]] = {}
+            self._open: Dict[Any, Dict[str, Any]] = {}
+            self._trace_id = uuid.uuid4().hex
+
+    def _add(self, task: Optional[str], agent: Optional[str], **values: float) -> None:
+        if agent and agent.strip() == PLANNER_ROLE:
+            # crewAI's planner runs an unnamed task whose description embeds every task summary
+            task = "planning"
+        with self._lock:
+            for bucket in (self.by_task[_label(task)], self.by_agent[_label(agent)]):
+                for key, value in values.items():
+                    bucket[key] += value
+
+    def _start_span(self, key: Any, name: str, parent: Any = None, **attributes: Any) -> None:
+        with self._lock:
+            parent_span = self._open.get(parent)
+            self._open[key] = {
+                "trace_id": self._trace_id,
+                "span_id": uuid.uuid4().hex[:16],
+                "parent_span_id": parent_span["span_id"] if parent_span else None,
+                "name": name,
+                "start_time_unix_nano": time.time_ns(),
+                "started": time.perf_counter(),
+                "attributes": attributes,
+            }
+
+    def _end_span(self, key: Any, status: str = "OK", **attributes: Any) -> float:
+        """Close a span and return its duration in seconds (0 if it was never opened)."""
+        with self._lock:
+            span = self._open.pop(key, None)
+        if span is None:
+            return 0.0
+        duration = time.perf_counter() - span.pop("started")
+        if self.span_exporter is not None:
+            span.update(end_time_unix_nano=time.time_ns(), status=status)
+            span["attributes"].update(attributes)
+            self.span_exporter.export(span)
+        return duration
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(CrewKickoffStartedEvent)
+        def on_crew_started(source, event):
+            self._start_span(("crew", id(source)), "crew.kickoff", crew=event.crew_name)
+
+        @crewai_event_bus.on(CrewKickoffCompletedEvent)
+        def on_crew_completed(source, event):
+            duration = self._end_span(("crew", id(source)))
+            with self._lock:
+                self.crew_wall_s += duration
+
+        @crewai_event_bus.on(CrewKickoffFailedEvent)
+        def on_crew_failed(source, event):
+            duration = self._end_span(("crew", id(source)), status="ERROR", error=event.error)
+            with self._lock:
+                self.crew_wall_s += duration
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            task = event.task
+            crew = getattr(task.agent, "crew", None) if task.agent else None
+            self._start_span(("task", str(task.id)), f"task {_label(task.name)}", parent=("crew", id(crew)), task=task.name)
+
+        def _task_finished(event, status="OK", **attributes):
+            task = event.task
+            if task is None:
+                return
+            duration = self._end_span(("task", str(task.id)), status=status, **attributes)
+            agent = task.agent.role if task.agent else None
+            self._add(task.name or task.description, agent, wall_s=duration)
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            _task_finished(event)
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            _task_finished(event, status="ERROR", error=event.error)
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event):
+            self._start_span(
+                ("llm", threading.get_ident()), "llm.call", parent=("task", str(event.task_id)),
+                model=event.model, prompt_tokens=estimate_tokens(event.messages),
+            )
+            self._add(event.task_name, event.agent_role, llm_calls=1, prompt_tokens=estimate_tokens(event.messages))
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event):
+            completion_tokens = estimate_tokens(event.response)
+            duration = self._end_span(("llm", threading.get_ident()), completion_tokens=completion_tokens)
+            self._add(event.task_name, event.agent_role, llm_s=duration, completion_tokens=completion_tokens)
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_failed(source, event):
+            duration = self._end_span(("llm", threading.get_ident()), status="ERROR", error=event.error)
+            self._add(event.task_name, event.agent_role, llm_s=duration)
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            duration = (event.finished_at - event.started_at).total_seconds()
+            if self.span_exporter is not None:
+                self.span_exporter.export({
+                    "trace_id": self._trace_id,
+                    "span_id": uuid.uuid4().hex[:16],
+                    "parent_span_id": (self._open.get(("task", str(event.task_id))) or {}).get("span_id"),
+                    "name": f"tool {event.tool_name}",
+                    "start_time_unix_nano": int(event.started_at.timestamp() * 1e9),
+                    "end_time_unix_nano": int(event.finished_at.timestamp() * 1e9),
+                    "status": "OK",
+                    "attributes": {"tool": event.tool_name, "from_cache": event.from_cache},
+                })
+            self._add(event.task_name, event.agent_role, tool_calls=1, tool_s=duration)
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_error(source, event):
+            self._add(event.task_name, event.agent_role, tool_calls=1, tool_errors=1)
+
+    def record_budgets(self, run: str, report: Dict[str, Any]) -> None:
+        """Keep a run's deadline report (startup_validate.deadline.Deadline.report)."""
+        with self._lock:
+            self.budgets[run] = report
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Machine-readable metrics, rounded for readability."""
+        def rounded(rows: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+            return {name: {key: round(value, 3) for key, value in row.items()} for name, row in rows.items()}
+
+        with self._lock:
+            by_task, by_agent = rounded(self.by_task), rounded(self.by_agent)
+            totals = {key: round(sum(row[key] for row in self.by_agent.values()), 3) for key in COUNTERS}
+            totals["wall_s"] = round(self.crew_wall_s, 3)
+            budgets = dict(self.budgets)
+        snapshot = {"totals": totals, "by_task": by_task, "by_agent": by_agent}
+        if budgets:
+            snapshot["budgets"] = budgets
+        return snapshot
+
+    def write_json(self, path: str) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        return target
+
+    def summary_table(self) -> str:
+        """Fixed-width per-task and per-agent table for the terminal."""
+        snapshot = self.snapshot()
+        header = f"{'':<50}{'wall s':>9}{'LLM':>6}{'LLM s':>9}{'prompt tok':>12}{'compl tok':>11}{'tools':>7}{'tool s':>9}"
+        lines: List[str] = []
+        for title, rows in (("Per task", snapshot["by_task"]), ("Per agent", snapshot["by_agent"])):
+            lines += [title, header]
+            for name, row in sorted(rows.items(), key=lambda item: -item[1]["wall_s"]):
+                lines.append(
+                    f"{name:<50}{row['wall_s']:>9.1f}{int(row['llm_calls']):>6}{row['llm_s']:>9.1f}"
+                    f"{int(row['prompt_tokens']):>12}{int(row['completion_tokens']):>11}"
+                    f"{int(row['tool_calls']):>7}{row['tool_s']:>9.1f}"
+                )
+            lines.append("")
+        for run, report in snapshot.get("budgets", {}).items():
+            lines += [f"Time budget: {report['used_s']:.1f}s of {report['deadline_s']:g}s ({_label(run)})",
+                      f"{'':<50}{'budget s':>9}{'used s':>9}{'used':>7}{'wrap-up':>9}{'forced':>8}"]
+            for name, row in report["tasks"].items():
+                lines.append(
+                    f"{_label(name):<50}{row['budget_s']:>9.1f}{row['used_s']:>9.1f}{row['used_ratio']:>7.0%}"
+                    f"{row['wrap_ups']:>9}{row['forced_answers']:>8}"
+                )
+            lines.append("")
+        totals = snapshot["totals"]
+        lines.append(
+            f"Total: {totals['wall_s']:.1f}s wall, {int(totals['llm_calls'])} LLM calls, "
+            f"{int(totals['prompt_tokens'])} prompt / {int(totals['completion_tokens'])} completion tokens, "
+            f"{int(totals['tool_calls'])} tool calls"
+        )
+        return "\n".join(lines)
+
+
+_collector: Optional[MetricsCollector] = None
+
+
+def get_metrics() -> MetricsCollector:
+    """Process-wide metrics collector; spans go to METRICS_SPANS_FILE when set."""
+    global _collector
+    if _collector is None:
+        spans_file = os.getenv("METRICS_SPANS_FILE")
+        _collector = MetricsCollector(SpanExporter(spans_file) if spans_file else None)
+    return _collector
@@ -0,0 +1,144 @@
+"""
+Structured task outputs (enabled with STRUCTURED_OUTPUTS=true).
+
+Specialists return these models instead of free-form markdown, so the
+scorer and the manager read typed fields, and the final report is rendered
+from them by startup_validate.report.render_report.
+"""
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel, Field
+
+
+class Source(BaseModel):
+    title: str = Field(..., description="Title of the page, report or dataset")
+    url: str = Field(..., description="URL of the source")
+
+
+class MarketSizeEstimate(BaseModel):
+    value: str = Field(..., description="Estimate with currency and year, e.g. '$12.5B (2024)'")
+    method: str = Field(..., description="Formula or assumptions behind the estimate")
+    source_url: Optional[str] = Field(None, description="URL of the main supporting source")
+
+
+class Scenario(BaseModel):
+    name: str = Field(..., description="Base, Bull or Bear")
+    description: str = Field(..., description="What has to be true and the resulting outcome")
+
+
+class MarketAnalysis(BaseModel):
+    summary: str = Field(..., description="Two to four sentence overview of the market")
+    industry: str = Field(..., description="Industry classification")
+    tam: MarketSizeEstimate
+    sam: MarketSizeEstimate
+    som: MarketSizeEstimate
+    growth_rate: Optional[str] = Field(None, description="Market growth rate, e.g. '18% CAGR 2024-2030'")
+    demand_status: str = Field(..., description="rising, stable or declining")
+    maturity: str = Field(..., description="Market maturity stage")
+    trends: List[str] = Field(default_factory=list, description="Key industry trends, each with its evidence")
+    scenarios: List[Scenario] = Field(default_factory=list)
+    limitations: List[str] = Field(default_factory=list, description="Assumptions and data quality caveats")
+    sources: List[Source] = Field(default_factory=list)
+
+
+class Competitor(BaseModel):
+    name: str
+    kind: str = Field(..., description="direct, indirect or substitute")
+    positioning: str = Field(..., description="Target segment and value proposition")
+    key_metric: Optional[str] = Field(None, description="Funding, revenue, users or pricing, with year")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    source_url: Optional[str] = None
+
+
+class CompetitiveAnalysis(BaseModel):
+    summary: str = Field(..., description="Two to four sentence overview of the competitive landscape")
+    competitors: List[Competitor] = Field(default_factory=list)
+    saturation: str = Field(..., description="Competitive saturation: low, medium or high, with a reason")
+    market_gaps: List[str] = Field(default_factory=list)
+    differentiation: List[str] = Field(default_factory=list, description="Differentiation strategies")
+    five_forces: Dict[str, str] = Field(default_factory=dict, description="Porter's Five Forces: force -> assessment")
+    sources: List[Source] = Field(default_factory=list)
+
+
+class PricePoint(BaseModel):
+    tier: str
+    price: str = Field(..., description="Price with unit, e.g. '$49 per seat per month'")
+    benchmark: Optional[str] = Field(None, description="Comparable competitor pricing")
+
+
+class UnitEconomics(BaseModel):
+    cac: Optional[str] = Field(None, description="Customer acquisition cost")
+    ltv: Optional[str] = Field(None, description="Customer lifetime value")
+    gross_margin: Optional[str] = None
+    payback_months: Optional[str] = None
+    notes: Optional[str] = Field(None, description="Assumptions behind the numbers")
+
+
+class BusinessModelAnalysis(BaseModel):
+    summary: str = Field(..., description="Two to four sentence overview of the business model")
+    revenue_models: List[str] = Field(default_factory=list)
+    pricing: List[PricePoint] = Field(default_factory=list)
+    customer_segments: List[str] = Field(default_factory=list)
+    unit_economics: UnitEconomics = Field(default_factory=UnitEconomics)
+    go_to_market: List[str] = Field(default_factory=list, description="Phased go-to-market steps")
+    risks: List[str] = Field(default_factory=list, description="Key risks, each with its mitigation")
+    mvp_validation: List[str] = Field(default_factory=list, description="Experiments to validate the MVP")
+    sources: List[Source] = Field(default_factory=list)
+
+
+class Deal(BaseModel):
+    company: str
+    round: str = Field(..., description="Stage, e.g. Seed or Series A")
+    amount: str = Field(..., description="Round size with currency")
+    date: Optional[str] = None
+    investors: List[str] = Field(default_factory=list)
+    source_url: Optional[str] = None
+
+
+class FundingAnalysis(BaseModel):
+    summary: str = Field(..., description="Two to four sentence overview of the funding landscape")
+    deals: List[Deal] = Field(default_factory=list, description="Representative recent deals")
+    active_investors: List[str] = Field(default_factory=list)
+    typical_round_sizes: Dict[str, str] = Field(default_factory=dict, description="Stage -> typical round size")
+    valuation_notes: Optional[str] = None
+    fundraising_strategy: List[str] = Field(default_factory=list)
+    sources: List[Source] = Field(default_factory=list)
+
+
+class DimensionScore(BaseModel):
+    dimension: str = Field(..., description="e.g. Market opportunity, Defensibility")
+    score: int = Field(..., ge=1, le=10)
+    weight: float = Field(..., ge=0, le=1, description="Weight in the overall score; weights sum to 1")
+    rationale: str
+
+
+class ValidationScore(BaseModel):
+    dimensions: List[DimensionScore]
+    overall_score: float = Field(..., ge=1, le=10, description="Weighted overall score (1-10)")
+    verdict: str = Field(..., description="One sentence investability verdict")
+    sensitivity: Optional[str] = Field(None, description="Effect of +/-10% weight changes on the overall score")
+    strengths: List[str] = Field(default_factory=list)
+    weaknesses: List[str] = Field(default_factory=list)
+    recommendations: List[str] = Field(default_factory=list)
+    next_steps: List[str] = Field(default_factory=list)
+    chart_url: Optional[str] = Field(None, description="QuickChart URL visualising the dimension scores")
+    sources: List[Source] = Field(default_factory=list)
+
+
+class ExecutiveSummary(BaseModel):
+    summary: str = Field(..., description="Executive summary of the key findings, one or two paragraphs")
+    recommendation: str = Field(..., description="Decision recommendation: pursue, pivot or drop, with the reason")
+    key_risks: List[str] = Field(default_factory=list)
+    methodology: Optional[str] = Field(None, description="Short note on methodology and data quality")
+
+
+# output_pydantic model per task name
+TASK_MODELS: Dict[str, Type[BaseModel]] = {
+    "market_analysis_task": MarketAnalysis,
+    "competitive_analysis_task": CompetitiveAnalysis,
+    "business_model_task": BusinessModelAnalysis,
+    "funding_analysis_task": FundingAnalysis,
+    "validation_scoring_task": ValidationScore,
+    "manager_report_task": ExecutiveSummary,
+}
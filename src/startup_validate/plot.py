@@ -1,38 +1,59 @@
-from crewai.flow.flow import Flow, start, listen
-from crewai import Agent, Crew, Task, Process, LLM
-from crewai_tools import SerperDevTool
-from startup_validate.tools.custom_tool import QuickChartTool
-from startup_validate.crew import StartupValidate as StartupValidateCrew
+from crewai.flow.flow import Flow, start, listen, and_
+from crewai import Agent, Crew, Task, Process
+from startup_validate.tools.custom_tool import QuickChartBatchTool, QuickChartTool
+from startup_validate.tools.knowledge_search import KnowledgeSearchTool
+from startup_validate.compaction import FullReportTool, compact_context, context_budget
+from startup_validate.config_loader import load_config, load_env
+from startup_validate.llm import get_llm
+from startup_validate.research import pre_research_enabled, research_bundles
+from functools import cached_property
 from typing import List
+import asyncio
 import os
 import json
-import yaml
+import time
+
+
+def search_tool():
+    # crewai_tools is a large import, so it is deferred until a branch builds its agent
+    from startup_validate.tools.cached_search import CachedSerperDevTool
+
+    return CachedSerperDevTool()
+
+
+def research_tools():
+    """Specialist tools: the local knowledge index first (unless KNOWLEDGE_SEARCH=false), then web search."""
+    if os.getenv("KNOWLEDGE_SEARCH", "true").lower() in ("1", "true", "yes"):
+        return [KnowledgeSearchTool(), search_tool()]
+    return [search_tool()]
+
 
 class StartupValidateFlow(Flow):
-    """StartupValidate Flow - Hierarchical Multi-Agent System"""
-    
-    # Configure Gemini LLM
-    gemini_llm = LLM(
-        model="gemini/gemini-2.0-flash",
-        api_key=os.getenv("GEMINI_API_KEY"),
-        max_rpm=13,
-        temperature=0,
-        stop=["<stop>"]
-    )
+    """StartupValidate Flow - specialist branches fan out concurrently and join before the final report"""
     
-    # Load configs
-    agents_config = yaml.safe_load(open('/Users/rugvedpatil/Documents/crewai/startup_validate/src/startup_validate/config/agents.yaml'))   
-    tasks_config = yaml.safe_load(open('/Users/rugvedpatil/Documents/crewai/startup_validate/src/startup_validate/config/tasks.yaml'))
+    # Package configs, parsed on first use (and once per process)
+    @cached_property
+    def agents_config(self):
+        return load_config("agents")
+
+    @cached_property
+    def tasks_config(self):
+        return load_config("tasks")
 
     @start()
     def initialize_validation(self):
         """Initialize the startup validation process"""
+        load_env()
         print("🚀 Starting Hierarchical Startup Validation Flow")
         print(f"Flow State ID: {self.state['id']}")
         
         # Store initial state
         self.state["validation_status"] = "initialized"
-        self.state["startup_idea"] = "Sample startup idea"  # This would come from user input
+        self.state.setdefault("startup_idea", "Sample startup idea")  # Pass {"startup_idea": ...} to kickoff()
+        self.state["branch_timings"] = {}
+        
+        # Bound how many specialist branches run at once (FLOW_CONCURRENCY)
+        self._branch_semaphore = asyncio.Semaphore(int(os.getenv("FLOW_CONCURRENCY", "4")))
         
         print("✅ Validation process initialized")
         return "Validation initialized"
@@ -46,11 +67,14 @@ class StartupValidateFlow(Flow):
         manager_agent = Agent(
             config=self.agents_config['startup_validation_manager'],
             verbose=True,
-            llm=self.gemini_llm,
+            llm=get_llm(agent='startup_validation_manager'),
             respect_context_window=True,
             inject_date=True
         )
         
+        # Fetch every branch's likely searches in one concurrent burst before the branches fan out
+        self.state["pre_research"] = research_bundles(self.state["startup_idea"]) if pre_research_enabled() else {}
+
         # Manager coordinates the validation process
         coordination_result = f"Manager coordinating validation for: {self.state['startup_idea']}"
         self.state["manager_coordination"] = coordination_result
@@ -59,8 +83,25 @@ class StartupValidateFlow(Flow):
         print("✅ Manager Agent activated and coordinating")
         return coordination_result
 
+    async def _run_analysis(self, branch, agent, task_name, context=None):
+        """Run one specialist task off the event loop, bounded by the flow's concurrency limit"""
+        task = Task(
+            config=self.tasks_config[task_name],
+            agent=agent
+        )
+        task.interpolate_inputs_and_add_conversation_history({"startup_idea": self.state["startup_idea"]})
+        if self.state["pre_research"].get(task_name):
+            task.description = f"{task.description}\n\n{self.state['pre_research'][task_name]}"
+
+        async with self._branch_semaphore:
+            started = time.perf_counter()
+            result = await asyncio.to_thread(task.execute_sync, context=context)
+            self.state["branch_timings"][branch] = round(time.perf_counter() - started, 2)
+
+        return result.raw
+
     @listen(startup_validation_manager)
-    def run_market_analysis(self, manager_coordination):
+    async def run_market_analysis(self, manager_coordination):
         """Market Analyst - Analyzes market size, trends, and opportunities"""
         print("📊 Market Analyst: Analyzing market size and trends...")
         
@@ -68,30 +109,23 @@ class StartupValidateFlow(Flow):
         market_agent = Agent(
             config=self.agents_config['market_analyst'],
             verbose=True,
-            tools=[SerperDevTool()],
-            llm=self.gemini_llm,
+            tools=research_tools(),
+            llm=get_llm(agent='market_analyst'),
             respect_context_window=True,
             inject_date=True
         )
         
-        # Create market analysis task
-        market_task = Task(
-            config=self.tasks_config['market_analysis_task'],
-            agent=market_agent
-        )
-        
         # Execute market analysis
-        result = market_task.execute()
+        result = await self._run_analysis("market_analysis", market_agent, 'market_analysis_task')
         
         # Store result in state
         self.state["market_analysis"] = result
-        self.state["validation_status"] = "market_analysis_complete"
         
         print("✅ Market Analysis completed")
         return result
 
     @listen(startup_validation_manager)
-    def run_competitive_analysis(self, manager_coordination):
+    async def run_competitive_analysis(self, manager_coordination):
         """Competitive Researcher - Researches competitors and market positioning"""
         print("🔍 Competitive Researcher: Analyzing competitive landscape...")
         
@@ -99,31 +133,24 @@ class StartupValidateFlow(Flow):
         competitive_agent = Agent(
             config=self.agents_config['competitive_researcher'],
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=research_tools(),
             max_retry_limit=3,
-            llm=self.gemini_llm,
+            llm=get_llm(agent='competitive_researcher'),
             respect_context_window=True,
             inject_date=True
         )
         
-        # Create competitive analysis task
-        competitive_task = Task(
-            config=self.tasks_config['competitive_analysis_task'],
-            agent=competitive_agent
-        )
-        
         # Execute competitive analysis
-        result = competitive_task.execute()
+        result = await self._run_analysis("competitive_analysis", competitive_agent, 'competitive_analysis_task')
         
         # Store result in state
         self.state["competitive_analysis"] = result
-        self.state["validation_status"] = "competitive_analysis_complete"
         
         print("✅ Competitive Analysis completed")
         return result
 
     @listen(startup_validation_manager)
-    def run_business_model_analysis(self, manager_coordination):
+    async def run_business_model_analysis(self, manager_coordination):
         """Business Model Analyst - Evaluates revenue models and monetization"""
         print("💰 Business Model Analyst: Evaluating business models...")
         
@@ -131,31 +158,24 @@ class StartupValidateFlow(Flow):
         business_agent = Agent(
             config=self.agents_config['business_model_analyst'],
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=research_tools(),
             max_retry_limit=3,
-            llm=self.gemini_llm,
+            llm=get_llm(agent='business_model_analyst'),
             respect_context_window=True,
             inject_date=True
         )
         
-        # Create business model task
-        business_task = Task(
-            config=self.tasks_config['business_model_task'],
-            agent=business_agent
-        )
-        
         # Execute business model analysis
-        result = business_task.execute()
+        result = await self._run_analysis("business_model_analysis", business_agent, 'business_model_task')
         
         # Store result in state
         self.state["business_model_analysis"] = result
-        self.state["validation_status"] = "business_model_analysis_complete"
         
         print("✅ Business Model Analysis completed")
         return result
 
     @listen(startup_validation_manager)
-    def run_funding_analysis(self, manager_coordination):
+    async def run_funding_analysis(self, manager_coordination):
         """Funding Analyst - Analyzes funding landscape and investor activity"""
         print("💼 Funding Analyst: Analyzing funding landscape...")
         
@@ -163,53 +183,48 @@ class StartupValidateFlow(Flow):
         funding_agent = Agent(
             config=self.agents_config['funding_analyst'],
             verbose=True,
-            tools=[SerperDevTool()],
+            tools=research_tools(),
             max_retry_limit=3,
-            llm=self.gemini_llm,
+            llm=get_llm(agent='funding_analyst'),
             respect_context_window=True,
             inject_date=True
         )
         
-        # Create funding analysis task
-        funding_task = Task(
-            config=self.tasks_config['funding_analysis_task'],
-            agent=funding_agent
-        )
-        
         # Execute funding analysis
-        result = funding_task.execute()
+        result = await self._run_analysis("funding_analysis", funding_agent, 'funding_analysis_task')
         
         # Store result in state
         self.state["funding_analysis"] = result
-        self.state["validation_status"] = "funding_analysis_complete"
         
         print("✅ Funding Analysis completed")
         return result
 
-    @listen(startup_validation_manager)
-    def run_validation_scoring(self, manager_coordination):
+    @listen(and_(run_market_analysis, run_competitive_analysis, run_business_model_analysis, run_funding_analysis))
+    async def run_validation_scoring(self):
         """Validation Scorer - Provides comprehensive scoring and assessment"""
         print("📈 Validation Scorer: Providing comprehensive scoring...")
         
+        # Score against budgeted digests of the four specialist analyses; full texts stay available via the tool
+        analyses = {
+            "market_analysis_task": self.state["market_analysis"],
+            "competitive_analysis_task": self.state["competitive_analysis"],
+            "business_model_task": self.state["business_model_analysis"],
+            "funding_analysis_task": self.state["funding_analysis"],
+        }
+        
         # Create validation scorer agent
         scorer_agent = Agent(
             config=self.agents_config['validation_scorer'],
             verbose=True,
-            tools=[SerperDevTool(), QuickChartTool()],
+            tools=[search_tool(), QuickChartTool(), QuickChartBatchTool(), FullReportTool(reports=lambda: analyses)],
             max_retry_limit=3,
-            llm=self.gemini_llm,
+            llm=get_llm(agent='validation_scorer'),
             respect_context_window=True,
             inject_date=True
         )
         
-        # Create validation scoring task
-        scoring_task = Task(
-            config=self.tasks_config['validation_scoring_task'],
-            agent=scorer_agent
-        )
-        
-        # Execute validation scoring
-        result = scoring_task.execute()
+        context = compact_context(list(analyses.items()), context_budget("validation_scoring_task"))
+        result = await self._run_analysis("validation_scoring", scorer_agent, 'validation_scoring_task', context=context)
         
         # Store result in state
         self.state["validation_scoring"] = result
@@ -218,8 +233,8 @@ class StartupValidateFlow(Flow):
         print("✅ Validation Scoring completed")
         return result
 
-    @listen(run_validation_scoring)
-    def generate_final_report(self, validation_scoring_result):
+    @listen(and_(run_market_analysis, run_competitive_analysis, run_business_model_analysis, run_funding_analysis, run_validation_scoring))
+    def generate_final_report(self):
         """Generate final comprehensive validation report"""
         print("📋 Generating Final Comprehensive Validation Report...")
         
@@ -233,6 +248,7 @@ class StartupValidateFlow(Flow):
             "business_model_analysis": self.state.get("business_model_analysis", ""),
             "funding_analysis": self.state.get("funding_analysis", ""),
             "validation_scoring": self.state.get("validation_scoring", ""),
+            "branch_timings": self.state.get("branch_timings", {}),
             "validation_status": "all_analyses_complete"
         }
         
@@ -280,10 +296,10 @@ def plot():
     flow.plot("flow_visualization")
     print("📊 Flow visualization saved as flow_visualization.html")
 
-def kickoff():
+def kickoff(startup_idea=None):
     """Run the startup validation flow"""
     flow = StartupValidateFlow()
-    result = flow.kickoff()
+    result = flow.kickoff(inputs={"startup_idea": startup_idea} if startup_idea else None)
     print("🎉 Flow execution completed!")
     print(f"Final result: {result}")
     return result
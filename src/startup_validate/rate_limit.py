@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Rough token count (~4 characters per token) for messages or a response."""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return max(1, len(payload) // 4)
+    if isinstance(payload, dict):
+        return estimate_tokens(payload.get("content"))
+    if isinstance(payload, (list, tuple)):
+        return sum(estimate_tokens(item) for item in payload)
+    return estimate_tokens(str(payload))
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests per minute and tokens per minute.
+
+    With `state_file` set, bucket state lives in that file and is guarded by
+    an exclusive `flock`, so every process on the host draws from one quota.
+    Otherwise state is kept in memory and shared by the threads of this process.
+    """
+
+    def __init__(self, rpm: int, tpm: int, state_file: Optional[str] = None):
+        if rpm < 1 or tpm < 1:
+            raise ValueError("rpm and tpm must be positive")
+        self.rpm = rpm
+        self.tpm = tpm
+        self.state_file = state_file
+        if state_file and fcntl is None:
+            raise RuntimeError("The file rate-limit backend needs fcntl (POSIX only)")
+        self._lock = threading.Lock()
+        self._state: Dict[str, float] = self._full_state()
+
+    def _full_state(self) -> Dict[str, float]:
+        return {"requests": float(self.rpm), "tokens": float(self.tpm), "updated": time.time()}
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, float]]:
+        """Yield the bucket state under the thread (and optionally file) lock."""
+        with self._lock:
+            if not self.state_file:
+                yield self._state
+                return
+            with open(self.state_file, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    raw = f.read()
+                    state = json.loads(raw) if raw.strip() else self._full_state()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict[str, float]) -> None:
+        now = time.time()
+        elapsed = max(0.0, now - state["updated"])
+        state["requests"] = min(self.rpm, state["requests"] + elapsed * self.rpm / 60)
+        state["tokens"] = min(self.tpm, state["tokens"] + elapsed * self.tpm / 60)
+        state["updated"] = now
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Block until one request and `tokens` tokens are available, then take them.
+        Returns the number of seconds spent waiting.
+        """
+        tokens = min(tokens, self.tpm)
+        waited = 0.0
+        while True:
+            with self._locked_state() as state:
+                self._refill(state)
+                if state["requests"] >= 1 and state["tokens"] >= tokens:
+                    state["requests"] -= 1
+                    state["tokens"] -= tokens
+                    return waited
+                delay = max(
+                    (1 - state["requests"]) * 60 / self.rpm,
+                    (tokens - state["tokens"]) * 60 / self.tpm,
+                )
+            delay = max(delay, 0.05)
+            time.sleep(delay)
+            waited += delay
+
+    def record(self, tokens: int) -> None:
+        """Charge tokens that were only known after the call (e.g. the completion)."""
+        if tokens <= 0:
+            return
+        with self._locked_state() as state:
+            self._refill(state)
+            state["tokens"] -= tokens
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from GEMINI_RPM, GEMINI_TPM and RATE_LIMIT_STATE_FILE."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                rpm=int(os.getenv("GEMINI_RPM", "13")),
+                tpm=int(os.getenv("GEMINI_TPM", "1000000")),
+                state_file=os.getenv("RATE_LIMIT_STATE_FILE") or None,
+            )
+        return _limiter
@@ -0,0 +1,241 @@
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+from crewai.tasks.task_output import TaskOutput
+from pydantic import BaseModel, ValidationError
+
+from startup_validate import models
+from startup_validate.tools.chart_store import expand_chart_refs
+
+SECTION_TITLES = {
+    "market_analysis_task": "Market Analysis",
+    "competitive_analysis_task": "Competitive Landscape",
+    "business_model_task": "Business Model",
+    "funding_analysis_task": "Funding Landscape",
+    "validation_scoring_task": "Validation Scoring",
+    "manager_report_task": "Final Report",
+}
+
+
+class StreamingReportWriter:
+    """
+    Appends each task's output to the report file (and echoes it to stdout)
+    the moment the task finishes, instead of writing everything at the end.
+    """
+
+    def __init__(self, path: str, startup_idea: str, echo: bool = True):
+        self.path = Path(path)
+        self.echo = echo
+        self._lock = threading.Lock()
+        self._citations = Citations()
+        self.path.write_text(f"# Startup Validation: {startup_idea}\n\n", encoding="utf-8")
+
+    def __call__(self, output: TaskOutput) -> None:
+        title = SECTION_TITLES.get(output.name or "", output.name or "Task Output")
+        structured = structured_output(output)
+        # Specialist tasks may finish concurrently in the dag process
+        with self._lock:
+            body = render_section(output.name, structured, self._citations) if structured else output.raw.strip()
+            section = f"## {title}\n\n{expand_chart_refs(body)}\n\n---\n\n"
+            if output.name == "manager_report_task" and self._citations.sources:
+                section += f"## References\n\n{self._citations.references()}\n"
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(section)
+            if self.echo:
+                print(f"\n📝 {title} written to {self.path}\n")
+
+
+_token_streaming_enabled = False
+
+
+def stream_tokens_to_stdout(task_name: Optional[str] = "manager_report_task") -> None:
+    """
+    Print LLM tokens as they arrive for `task_name` (every task if None).
+    Only LLMs created with stream=True emit chunks.
+    """
+    global _token_streaming_enabled
+    if _token_streaming_enabled:
+        return
+    _token_streaming_enabled = True
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _print_chunk(source, event: LLMStreamChunkEvent) -> None:
+        if event.tool_call is None and (task_name is None or event.task_name == task_name):
+            sys.stdout.write(event.chunk)
+            sys.stdout.flush()
+
+
+def structured_output(output: Optional[TaskOutput]) -> Optional[BaseModel]:
+    """The task's output model; outputs restored from checkpoints are parsed from their raw JSON."""
+    if output is None:
+        return None
+    if output.pydantic is not None:
+        return output.pydantic
+    model = models.TASK_MODELS.get(output.name or "")
+    if model is None:
+        return None
+    try:
+        return model.model_validate_json(output.raw.strip().removeprefix("```json").removesuffix("```"))
+    except ValidationError:
+        return None
+
+
+class Citations:
+    """Numbers source URLs in order of first use for inline [n] citations."""
+
+    def __init__(self):
+        self.sources: Dict[str, str] = {}
+
+    def add(self, url: Optional[str], title: Optional[str] = None) -> str:
+        if not url:
+            return ""
+        if url not in self.sources:
+            self.sources[url] = title or url
+        elif title and self.sources[url] == url:
+            self.sources[url] = title
+        return f" [{list(self.sources).index(url) + 1}]"
+
+    def references(self) -> str:
+        return "\n".join(f"{n}. [{title}]({url})" for n, (url, title) in enumerate(self.sources.items(), start=1))
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items) or "- n/a"
+
+
+def _cell(text: Optional[str]) -> str:
+    return (text or "n/a").replace("|", "\\|").replace("\n", " ")
+
+
+def _render_market(m: models.MarketAnalysis, cite: Citations) -> str:
+    sizes = "\n".join(
+        f"| {label} | {_cell(estimate.value)} | {_cell(estimate.method)}{cite.add(estimate.source_url)} |"
+        for label, estimate in (("TAM", m.tam), ("SAM", m.sam), ("SOM", m.som))
+    )
+    scenarios = "\n".join(f"- **{s.name}**: {s.description}" for s in m.scenarios) or "- n/a"
+    return (
+        f"{m.summary}\n\n"
+        f"**Industry:** {m.industry} · **Demand:** {m.demand_status} · **Maturity:** {m.maturity}"
+        f"{f' · **Growth:** {m.growth_rate}' if m.growth_rate else ''}\n\n"
+        f"| Metric | Estimate | Method |\n| --- | --- | --- |\n{sizes}\n\n"
+        f"### Trends\n\n{_bullets(m.trends)}\n\n"
+        f"### Scenarios\n\n{scenarios}\n\n"
+        f"### Limitations\n\n{_bullets(m.limitations)}"
+    )
+
+
+def _render_competitive(c: models.CompetitiveAnalysis, cite: Citations) -> str:
+    rows = "\n".join(
+        f"| {_cell(x.name)}{cite.add(x.source_url, x.name)} | {_cell(x.kind)} | {_cell(x.positioning)} | "
+        f"{_cell(x.key_metric)} | {_cell('; '.join(x.strengths))} | {_cell('; '.join(x.weaknesses))} |"
+        for x in c.competitors
+    )
+    forces = "\n".join(f"- **{force}**: {assessment}" for force, assessment in c.five_forces.items()) or "- n/a"
+    return (
+        f"{c.summary}\n\n**Saturation:** {c.saturation}\n\n"
+        "| Competitor | Type | Positioning | Key metric | Strengths | Weaknesses |\n"
+        f"| --- | --- | --- | --- | --- | --- |\n{rows}\n\n"
+        f"### Market gaps\n\n{_bullets(c.market_gaps)}\n\n"
+        f"### Differentiation\n\n{_bullets(c.differentiation)}\n\n"
+        f"### Five Forces\n\n{forces}"
+    )
+
+
+def _render_business_model(b: models.BusinessModelAnalysis, cite: Citations) -> str:
+    pricing = "\n".join(f"| {_cell(p.tier)} | {_cell(p.price)} | {_cell(p.benchmark)} |" for p in b.pricing)
+    ue = b.unit_economics
+    return (
+        f"{b.summary}\n\n"
+        f"### Revenue models\n\n{_bullets(b.revenue_models)}\n\n"
+        f"### Pricing\n\n| Tier | Price | Benchmark |\n| --- | --- | --- |\n{pricing}\n\n"
+        f"### Customer segments\n\n{_bullets(b.customer_segments)}\n\n"
+        "### Unit economics\n\n| CAC | LTV | Gross margin | Payback (months) |\n| --- | --- | --- | --- |\n"
+        f"| {_cell(ue.cac)} | {_cell(ue.ltv)} | {_cell(ue.gross_margin)} | {_cell(ue.payback_months)} |\n\n"
+        f"{ue.notes or ''}\n\n"
+        f"### Go-to-market\n\n{_bullets(b.go_to_market)}\n\n"
+        f"### Risks\n\n{_bullets(b.risks)}\n\n"
+        f"### MVP validation\n\n{_bullets(b.mvp_validation)}"
+    )
+
+
+def _render_funding(f: models.FundingAnalysis, cite: Citations) -> str:
+    deals = "\n".join(
+        f"| {_cell(d.company)}{cite.add(d.source_url, d.company)} | {_cell(d.round)} | {_cell(d.amount)} | "
+        f"{_cell(d.date)} | {_cell(', '.join(d.investors))} |"
+        for d in f.deals
+    )
+    rounds = "\n".join(f"- **{stage}**: {size}" for stage, size in f.typical_round_sizes.items()) or "- n/a"
+    return (
+        f"{f.summary}\n\n"
+        f"| Company | Round | Amount | Date | Investors |\n| --- | --- | --- | --- | --- |\n{deals}\n\n"
+        f"### Typical round sizes\n\n{rounds}\n\n"
+        f"{f.valuation_notes or ''}\n\n"
+        f"### Active investors\n\n{_bullets(f.active_investors)}\n\n"
+        f"### Fundraising strategy\n\n{_bullets(f.fundraising_strategy)}"
+    )
+
+
+def _render_scoring(v: models.ValidationScore, cite: Citations) -> str:
+    rows = "\n".join(
+        f"| {_cell(d.dimension)} | {d.score}/10 | {d.weight:.0%} | {_cell(d.rationale)} |" for d in v.dimensions
+    )
+    chart = f"\n\n![Validation scores]({v.chart_url})" if v.chart_url else ""
+    return (
+        f"**Overall score: {v.overall_score:.1f}/10** — {v.verdict}\n\n"
+        f"| Dimension | Score | Weight | Rationale |\n| --- | --- | --- | --- |\n{rows}{chart}\n\n"
+        f"{f'**Sensitivity:** {v.sensitivity}' if v.sensitivity else ''}\n\n"
+        f"### Strengths\n\n{_bullets(v.strengths)}\n\n"
+        f"### Weaknesses\n\n{_bullets(v.weaknesses)}\n\n"
+        f"### Recommendations\n\n{_bullets(v.recommendations)}\n\n"
+        f"### Next steps\n\n{_bullets(v.next_steps)}"
+    )
+
+
+def _render_summary(e: models.ExecutiveSummary, cite: Citations) -> str:
+    methodology = f"\n\n### Methodology\n\n{e.methodology}" if e.methodology else ""
+    return (
+        f"{e.summary}\n\n**Recommendation:** {e.recommendation}\n\n"
+        f"### Key risks\n\n{_bullets(e.key_risks)}{methodology}"
+    )
+
+
+_RENDERERS = {
+    models.MarketAnalysis: _render_market,
+    models.CompetitiveAnalysis: _render_competitive,
+    models.BusinessModelAnalysis: _render_business_model,
+    models.FundingAnalysis: _render_funding,
+    models.ValidationScore: _render_scoring,
+    models.ExecutiveSummary: _render_summary,
+}
+
+
+def render_section(name: Optional[str], model: BaseModel, cite: Citations) -> str:
+    """Markdown body for one structured task output; its sources are added to `cite`."""
+    for source in getattr(model, "sources", []):
+        cite.add(source.url, source.title)
+    return _RENDERERS[type(model)](model, cite).strip()
+
+
+def render_report(startup_idea: str, outputs: Dict[str, TaskOutput]) -> str:
+    """
+    Render the final report from structured task outputs: the manager's
+    executive summary first, then one section per task, then references.
+    Tasks without a structured output fall back to their raw text.
+    """
+    order = ["manager_report_task", *(name for name in SECTION_TITLES if name != "manager_report_task")]
+    cite = Citations()
+    parts = [f"# Startup Validation: {startup_idea}"]
+    for name in order:
+        output = outputs.get(name)
+        if output is None:
+            continue
+        structured = structured_output(output)
+        title = "Executive Summary" if name == "manager_report_task" else SECTION_TITLES[name]
+        body = render_section(name, structured, cite) if structured else output.raw.strip()
+        parts.append(f"## {title}\n\n{body}")
+    if cite.sources:
+        parts.append(f"## References\n\n{cite.references()}")
+    return "\n\n".join(parts) + "\n"
@@ -0,0 +1,117 @@
+"""
+Up-front search planning for the four specialist tasks.
+
+Before the specialists start, the searches they are most likely to run are
+generated from QUERY_TEMPLATES for all four tasks at once, deduplicated
+across tasks (by normalized query, as in the search cache) and fetched in
+one concurrent burst of at most PRE_RESEARCH_CONCURRENCY requests over the
+search tool's pooled keep-alive session. Every result lands in the search
+cache, so an agent repeating a query gets it without a round-trip, and each
+task's description gets its results as a bundle, so that the agents start
+from the evidence instead of searching for it one query at a time.
+"""
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+QUERY_TEMPLATES: Dict[str, tuple] = {
+    "market_analysis_task": ("{topic} market size", "{topic} industry trends", "{topic} startups"),
+    "competitive_analysis_task": ("{topic} competitors", "{topic} alternatives", "{topic} startups"),
+    "business_model_task": ("{topic} pricing", "{topic} business model"),
+    "funding_analysis_task": ("{topic} startup funding rounds", "{topic} startups"),
+}
+TOPIC_WORDS = 8
+RESULTS_PER_QUERY = 4
+SNIPPET_CHARS = 240
+TOPIC_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the this to via was "
+    "which who will with".split()
+)
+
+
+def pre_research_enabled() -> bool:
+    return os.getenv("PRE_RESEARCH", "true").lower() in ("1", "true", "yes")
+
+
+def idea_topic(startup_idea: str, max_words: int = TOPIC_WORDS) -> str:
+    """The idea's first content words: short enough for a search query."""
+    words = [word for word in re.findall(r"[\w'-]+", startup_idea) if word.casefold() not in TOPIC_STOPWORDS]
+    return " ".join(words[:max_words])
+
+
+def plan_queries(startup_idea: str, task_names: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    Queries per specialist task (all four, or `task_names`). A query that
+    normalizes like an earlier one, in any task, is given in that one's
+    spelling, so that each distinct search appears once in the fetch.
+    """
+    # crewai_tools is a large import, so it is deferred until a run needs it
+    from startup_validate.tools.cached_search import normalize_query
+
+    topic = idea_topic(startup_idea)
+    seen: Dict[str, str] = {}
+    plan = {}
+    for name in task_names or QUERY_TEMPLATES:
+        queries = [template.format(topic=topic) for template in QUERY_TEMPLATES.get(name, ())]
+        plan[name] = list(dict.fromkeys(seen.setdefault(normalize_query(query), query) for query in queries))
+    return plan
+
+
+def fetch_all(queries: Iterable[str], concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Results by query, fetched concurrently; cached queries are answered from
+    the search cache. A failed query is left out, and its task's agent can
+    still search for it itself.
+    """
+    from startup_validate.tools.cached_search import CachedSerperDevTool
+
+    unique = list(dict.fromkeys(queries))
+    if not unique:
+        return {}
+    concurrency = concurrency or int(os.getenv("PRE_RESEARCH_CONCURRENCY", "8"))
+    tool = CachedSerperDevTool()
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(unique)), thread_name_prefix="pre-research") as pool:
+        futures = {query: pool.submit(tool._run, search_query=query) for query in unique}
+    results = {}
+    for query, future in futures.items():
+        try:
+            results[query] = future.result()
+        except Exception as e:
+            print(f"Pre-research query {query!r} failed: {e}")
+    return results
+
+
+def format_bundle(queries: List[str], results: Dict[str, Any]) -> str:
+    """A task's pre-fetched results as text for its description."""
+    sections = []
+    for query in queries:
+        result = results.get(query)
+        if not isinstance(result, dict):
+            continue
+        lines = []
+        for item in (result.get("organic") or [])[:RESULTS_PER_QUERY]:
+            snippet = " ".join(str(item.get("snippet", "")).split())[:SNIPPET_CHARS]
+            lines.append(f"- {item.get('title', '')} ({item.get('link', '')}): {snippet}")
+        if lines:
+            sections.append(f"Search: {query}\n" + "\n".join(lines))
+    if not sections:
+        return ""
+    bundle = (
+        "Pre-fetched search results for this task (cite them by link; search only for what they do not cover):\n\n"
+        + "\n\n".join(sections)
+    )
+    # Descriptions are templates; braces in snippets must not read as {variables}
+    return bundle.replace("{", "(").replace("}", ")")
+
+
+def research_bundles(startup_idea: str, task_names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Plan, fetch and format the pre-research of the specialist tasks, by task name."""
+    started = time.perf_counter()
+    plan = plan_queries(startup_idea, task_names)
+    queries = [query for task_queries in plan.values() for query in task_queries]
+    results = fetch_all(queries)
+    print(f"Pre-research: {len(queries)} queries, {len(set(queries))} distinct, {len(results)} answered "
+          f"in {time.perf_counter() - started:.2f}s")
+    return {name: format_bundle(task_queries, results) for name, task_queries in plan.items()}
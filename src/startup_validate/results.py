@@ -0,0 +1,242 @@
+"""
+Results of past validations, for answering repeated startup ideas.
+
+Every finished run is stored under its normalized idea (case, whitespace and
+punctuation ignored) together with a hashed n-gram vector of the idea. A new
+idea is answered from the store when it matches a fresh result exactly, and
+reuses the specialists' outputs when it is a near-duplicate (cosine
+similarity of the vectors at or above RESULT_SIMILARITY); only scoring and
+the final report then run. An edited idea can instead be re-validated
+incrementally against its prior run (startup_validate.incremental).
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from crewai.tasks.task_output import TaskOutput
+
+from startup_validate.cache import DEFAULT_CACHE_PATH
+from startup_validate.checkpoint import CheckpointStore
+from startup_validate.incremental import affected_tasks
+
+# Outputs that depend only on the research, not on the exact wording of the idea
+REUSABLE_TASKS = ("market_analysis_task", "competitive_analysis_task", "business_model_task", "funding_analysis_task")
+VECTOR_DIMS = 2048
+
+
+def result_key(startup_idea: str) -> str:
+    """Idea with case, punctuation and whitespace differences removed."""
+    return " ".join(re.sub(r"[^\w\s]", " ", startup_idea.casefold()).split())
+
+
+def idea_vector(startup_idea: str, dims: int = VECTOR_DIMS) -> np.ndarray:
+    """Unit-length hashed bag of words and character trigrams."""
+    text = result_key(startup_idea)
+    grams = text.split() + [text[i:i + 3] for i in range(len(text) - 2)]
+    vector = np.zeros(dims, dtype=np.float32)
+    for gram in grams:
+        # A stable hash, since vectors are compared across processes
+        digest = int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "little")
+        vector[digest % dims] += 1.0 if digest >> 63 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class ResultStore:
+    """
+    Final reports and task outputs by normalized idea, in SQLite, with an
+    in-memory similarity index that loads only rows it has not seen yet.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        table: str = "idea_results",
+        similarity: float = 0.9,
+        max_age_seconds: Optional[float] = 604800,
+    ):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid result table name: {table!r}")
+        self.table = table
+        self.path = path or os.getenv("CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.similarity = similarity
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, startup_idea TEXT NOT NULL, vector BLOB NOT NULL, "
+                "report TEXT NOT NULL, outputs TEXT NOT NULL, saved_at REAL NOT NULL)"
+            )
+        # key -> (vector, saved_at); rows are loaded incrementally by rowid
+        self._index: Dict[str, Tuple[np.ndarray, float]] = {}
+        self._last_rowid = 0
+
+    def _refresh(self) -> None:
+        rows = self._conn.execute(
+            f"SELECT rowid, key, vector, saved_at FROM {self.table} WHERE rowid > ? ORDER BY rowid",
+            (self._last_rowid,),
+        ).fetchall()
+        for rowid, key, vector, saved_at in rows:
+            self._index[key] = (np.frombuffer(vector, dtype=np.float32), saved_at)
+            self._last_rowid = rowid
+
+    def _fresh(self, saved_at: float) -> bool:
+        return self.max_age_seconds is None or time.time() - saved_at <= self.max_age_seconds
+
+    def save(self, startup_idea: str, report: str, outputs: Dict[str, TaskOutput]) -> None:
+        """Store a finished run's report and task outputs (replacing an older run of the same idea)."""
+        record = {name: output.model_dump(mode="json", exclude={"pydantic", "json_dict"}) for name, output in outputs.items()}
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, startup_idea, vector, report, outputs, saved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (result_key(startup_idea), startup_idea, idea_vector(startup_idea).tobytes(),
+                 report, json.dumps(record), time.time()),
+            )
+
+    def lookup(self, startup_idea: str, similarity: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        The fresh stored result closest to `startup_idea`, or None if none is
+        similar enough (`similarity`, default the store's threshold). The
+        result has `startup_idea`, `similarity`, `exact`, `report`,
+        `saved_at` and `outputs` (TaskOutputs by task name).
+        """
+        threshold = self.similarity if similarity is None else similarity
+        key = result_key(startup_idea)
+        with self._lock:
+            self._refresh()
+            if key in self._index and self._fresh(self._index[key][1]):
+                best, score = key, 1.0
+            else:
+                candidates = [(k, v) for k, (v, saved_at) in self._index.items() if self._fresh(saved_at)]
+                if not candidates:
+                    return None
+                scores = np.stack([v for _, v in candidates]) @ idea_vector(startup_idea)
+                i = int(np.argmax(scores))
+                best, score = candidates[i][0], float(scores[i])
+                if score < threshold:
+                    return None
+        result = self.get(best)
+        if result is not None:
+            result.update(similarity=round(score, 4), exact=best == key)
+        return result
+
+    def get(self, startup_idea: str) -> Optional[Dict[str, Any]]:
+        """The stored result of `startup_idea` (normalized), however old, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT startup_idea, report, outputs, saved_at FROM {self.table} WHERE key = ?",
+                (result_key(startup_idea),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "startup_idea": row[0],
+            "similarity": 1.0,
+            "exact": True,
+            "report": row[1],
+            "saved_at": row[3],
+            "outputs": {name: TaskOutput(**output) for name, output in json.loads(row[2]).items()},
+        }
+
+_result_store: Optional[ResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """The shared result store, or None unless RESULT_CACHE is enabled."""
+    global _result_store
+    if os.getenv("RESULT_CACHE", "false").lower() not in ("1", "true", "yes"):
+        return None
+    with _result_store_lock:
+        if _result_store is None:
+            max_age = float(os.getenv("RESULT_MAX_AGE", "604800"))
+            _result_store = ResultStore(
+                similarity=float(os.getenv("RESULT_SIMILARITY", "0.9")),
+                max_age_seconds=max_age if max_age > 0 else None,
+            )
+        return _result_store
+
+
+def _seed_checkpoints(startup_idea: str, source: Dict[str, Any], tasks: List[str]) -> List[str]:
+    """
+    Replace the idea's checkpoints with the `source` run's outputs of `tasks`,
+    so that every other task runs again. Each seeded checkpoint records the
+    idea it was produced for.
+    """
+    checkpoints = CheckpointStore(startup_idea)
+    # Outputs of an earlier, interrupted run of this idea may predate the edit being re-validated
+    checkpoints.clear()
+    seeded = [name for name in tasks if name in source["outputs"]]
+    for name in seeded:
+        checkpoints.save(source["outputs"][name], source_idea=source["startup_idea"])
+    return seeded
+
+
+def _incremental_prior(store: ResultStore, startup_idea: str, prior_idea: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The stored run an edited idea is re-validated against, if incremental re-validation applies."""
+    if prior_idea:
+        prior = store.get(prior_idea)
+        if prior is None:
+            print(f"No stored run of {prior_idea!r}; validating {startup_idea!r} in full")
+        return prior
+    if os.getenv("INCREMENTAL_REVALIDATION", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return store.lookup(startup_idea, similarity=float(os.getenv("REVALIDATE_SIMILARITY", "0.5")))
+
+
+def reuse_results(startup_idea: str, prior_idea: Optional[str] = None) -> Tuple[Optional[str], bool]:
+    """
+    Check the result store before a run. Returns the stored report when the
+    idea matches a fresh result exactly (no run needed), and whether
+    specialist checkpoints were seeded from an earlier run, in which case
+    the run should resume so that only the remaining tasks execute.
+
+    An edited idea (`prior_idea`, or with INCREMENTAL_REVALIDATION the
+    closest stored run) reuses only the specialist outputs its edit does not
+    affect (startup_validate.incremental); otherwise a near-duplicate reuses
+    all of them.
+    """
+    store = get_result_store()
+    if store is None:
+        if prior_idea:
+            print(f"RESULT_CACHE is off, so no run of {prior_idea!r} is stored; validating {startup_idea!r} in full")
+        return None, False
+    match = store.lookup(startup_idea)
+    if match is not None and match["exact"]:
+        print(f"Reusing the stored report for {match['startup_idea']!r}")
+        return match["report"], False
+
+    prior = _incremental_prior(store, startup_idea, prior_idea)
+    if prior is not None:
+        rerun = affected_tasks(prior["startup_idea"], startup_idea)
+        reused = [name for name in REUSABLE_TASKS if name not in rerun]
+        seeded = _seed_checkpoints(startup_idea, prior, reused)
+        print(f"Re-validating the edit of {prior['startup_idea']!r}: re-running "
+              f"{', '.join(rerun) or 'no specialists'}, reusing {len(seeded)} specialist output(s)")
+        return None, bool(seeded)
+
+    if match is None:
+        return None, False
+    seeded = _seed_checkpoints(startup_idea, match, list(REUSABLE_TASKS))
+    print(f"Reusing {len(seeded)} specialist output(s) from {match['startup_idea']!r} "
+          f"(similarity {match['similarity']:.2f})")
+    return None, bool(seeded)
+
+
+def remember_results(startup_idea: str, report: str, outputs: Dict[str, TaskOutput]) -> None:
+    """Store a finished run when RESULT_CACHE is enabled."""
+    store = get_result_store()
+    if store is not None:
+        store.save(startup_idea, report, outputs)
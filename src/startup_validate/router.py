@@ -0,0 +1,222 @@
+"""
+Model routing by agent and task (config/models.yaml).
+
+Every agent gets a RoutedLLM for its tier. A call goes to the first model of
+the tier (or of the task's tier, when the task is routed separately), falls
+back to the next model on rate limits, server errors and timeouts, and can
+be hedged: once a request runs past a latency percentile of that model, the
+same request is sent to the next model and the first answer wins.
+"""
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import litellm
+
+from startup_validate.config_loader import load_config, load_yaml
+from startup_validate.deadline import apply_deadline, call_timeout, current_budget, force_answer
+from startup_validate.llm import StartupValidateLLM
+
+# Errors worth retrying on another model; anything else is raised as is
+FALLBACK_ERRORS = (
+    litellm.exceptions.RateLimitError,
+    litellm.exceptions.Timeout,
+    litellm.exceptions.ServiceUnavailableError,
+    litellm.exceptions.APIConnectionError,
+    litellm.exceptions.InternalServerError,
+    TimeoutError,
+)
+
+
+class LatencyTracker:
+    """Recent successful call latencies per model."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, model: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """The latency percentile for `model`, or None with fewer than `min_samples` calls."""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+
+class ModelRouter:
+    """Tiers, their models and the agent/task assignments from a models config."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.tiers: Dict[str, List[Dict[str, Any]]] = config.get("tiers") or {}
+        if not self.tiers:
+            raise ValueError("The models config defines no tiers")
+        for tier, models in self.tiers.items():
+            if not models or not all(entry.get("model") for entry in models):
+                raise ValueError(f"Model tier {tier!r} needs at least one entry, each with a `model`")
+        self.default_tier = config.get("default") or next(iter(self.tiers))
+        self.agent_tiers: Dict[str, str] = config.get("agents") or {}
+        self.task_tiers: Dict[str, str] = config.get("tasks") or {}
+        for name, tier in [("default", self.default_tier), *self.agent_tiers.items(), *self.task_tiers.items()]:
+            if tier not in self.tiers:
+                raise ValueError(f"{name!r} uses unknown model tier {tier!r}")
+
+        hedge = config.get("hedge") or {}
+        self.hedge = os.getenv("LLM_HEDGE", str(hedge.get("enabled", False))).lower() in ("1", "true", "yes")
+        self.hedge_percentile = float(hedge.get("percentile", 95))
+        self.hedge_min_samples = int(hedge.get("min_samples", 20))
+        self.latencies = LatencyTracker()
+        self._llms: Dict[tuple, List[StartupValidateLLM]] = {}
+        self._lock = threading.Lock()
+
+    def tier_for(self, agent: Optional[str] = None, task: Optional[str] = None) -> str:
+        """Tier for a task if it is routed, else for the agent, else the default."""
+        return self.task_tiers.get(task or "") or self.agent_tiers.get(agent or "") or self.default_tier
+
+    def models(self, tier: str, stream: bool = False) -> List[StartupValidateLLM]:
+        """The tier's LLMs in fallback order (built once per tier and `stream` setting)."""
+        with self._lock:
+            if (tier, stream) not in self._llms:
+                self._llms[tier, stream] = [
+                    StartupValidateLLM(
+                        model=entry["model"],
+                        api_key=os.getenv(entry.get("api_key_env", "GEMINI_API_KEY")),
+                        base_url=entry.get("base_url"),
+                        timeout=entry.get("timeout"),
+                        temperature=0,
+                        stop=["<stop>"],
+                        stream=stream,
+                    )
+                    for entry in self.tiers[tier]
+                ]
+            return self._llms[tier, stream]
+
+    def hedge_after(self, model: str) -> Optional[float]:
+        """Seconds after which a request to `model` is hedged, or None to never hedge."""
+        if not self.hedge:
+            return None
+        return self.latencies.percentile(model, self.hedge_percentile, self.hedge_min_samples)
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_router() -> ModelRouter:
+    """The process-wide router, from MODELS_CONFIG or the package's config/models.yaml."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            path = os.getenv("MODELS_CONFIG")
+            _router = ModelRouter(load_yaml(Path(path)) if path else load_config("models"))
+        return _router
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    with _router_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(
+                max_workers=int(os.getenv("LLM_HEDGE_THREADS", "16")), thread_name_prefix="llm-hedge"
+            )
+        return _hedge_pool
+
+
+class RoutedLLM(StartupValidateLLM):
+    """
+    The LLM an agent holds: it describes the tier's first model, and each
+    call is routed, fallen back and hedged across the tier's models.
+    """
+
+    def __init__(self, router: ModelRouter, tier: str, stream: bool = False):
+        primary = router.models(tier, stream)[0]
+        super().__init__(model=primary.model, temperature=0, stop=["<stop>"], stream=stream)
+        self.router = router
+        self.tier = tier
+
+    def _timed_call(self, llm: StartupValidateLLM, messages: Any, kwargs: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        response = llm.call(messages, **kwargs)
+        self.router.latencies.record(llm.model, time.perf_counter() - started)
+        return response
+
+    def _hedged_call(
+        self, llm: StartupValidateLLM, backup: Optional[StartupValidateLLM], messages: Any, kwargs: Dict[str, Any]
+    ) -> Any:
+        after = self.router.hedge_after(llm.model)
+        # Tool-executing and streamed calls have side effects, so they are never duplicated
+        if after is None or backup is None or self.stream or kwargs.get("available_functions"):
+            return self._timed_call(llm, messages, kwargs)
+
+        pool = _get_hedge_pool()
+        first = pool.submit(contextvars.copy_context().run, self._timed_call, llm, messages, kwargs)
+        try:
+            return first.result(timeout=after)
+        except FuturesTimeoutError:
+            pass
+        second = pool.submit(contextvars.copy_context().run, self._timed_call, backup, messages, kwargs)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower request finishes in the background and is discarded
+                    return future.result()
+        return first.result()
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None,
+    ) -> Any:
+        messages, partial_answer = apply_deadline(messages, from_task)
+        if partial_answer is not None:
+            return partial_answer
+
+        task_tier = self.router.task_tiers.get(getattr(from_task, "name", None) or "")
+        models = self.router.models(task_tier or self.tier, self.stream)
+        kwargs = dict(
+            tools=tools,
+            callbacks=callbacks,
+            available_functions=available_functions,
+            from_task=from_task,
+            from_agent=from_agent,
+            # Agent executors add their stop words to the LLM they hold; the tier's
+            # models are shared across crews, so the words go with each request
+            stop=self.stop,
+        )
+        for i, llm in enumerate(models):
+            # With RUN_DEADLINE, no request outlives its task's budget and grace period
+            kwargs["timeout"] = call_timeout(llm.timeout)
+            if kwargs["timeout"] != llm.timeout:
+                # A retry of a timed-out request would start past the deadline
+                kwargs["max_retries"] = 0
+            try:
+                # A single-model tier has nothing to hedge to
+                backup = models[(i + 1) % len(models)] if len(models) > 1 else None
+                return self._hedged_call(llm, backup, messages, kwargs)
+            except FALLBACK_ERRORS as e:
+                budget = current_budget()
+                if budget is not None and budget.overdue():
+                    # The request ran into the deadline; the task ends with what it has found
+                    return force_answer(budget, messages)
+                if i == len(models) - 1:
+                    raise
+                print(f"{llm.model} failed ({type(e).__name__}), falling back to {models[i + 1].model}")
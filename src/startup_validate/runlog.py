@@ -0,0 +1,207 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from crewai.events import (
+    BaseEventListener,
+    CrewKickoffCompletedEvent,
+    CrewKickoffFailedEvent,
+    CrewKickoffStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+)
+
+from startup_validate.rate_limit import estimate_tokens
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class JsonlRunLog:
+    """
+    Compact, append-only JSONL run log.
+
+    Long texts are never repeated: each task description is written once per
+    file as a `description` record and referenced by hash afterwards, and task
+    outputs go to `<directory>/outputs/<hash>.md` and are referenced by hash.
+    The log rotates to `run.1.jsonl`, `run.2.jsonl`, ... once it exceeds
+    `max_bytes`; with `compress` every file is gzip-compressed.
+    """
+
+    def __init__(
+        self,
+        directory: str = "logs",
+        max_bytes: int = 10_000_000,
+        backups: int = 5,
+        compress: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.outputs = self.directory / "outputs"
+        self.outputs.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.path = self.directory / ("run.jsonl.gz" if compress else "run.jsonl")
+        self._lock = threading.Lock()
+        self._described: set = set()
+
+    def _open(self):
+        if self.compress:
+            return gzip.open(self.path, "at", encoding="utf-8")
+        return self.path.open("a", encoding="utf-8")
+
+    def _rotate(self) -> None:
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        for index in range(self.backups - 1, 0, -1):
+            older = self.directory / f"run.{index}{suffix}"
+            if older.exists():
+                os.replace(older, self.directory / f"run.{index + 1}{suffix}")
+        os.replace(self.path, self.directory / f"run.1{suffix}")
+        # A fresh file must be readable on its own, so descriptions are written again
+        self._described.clear()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        record = {"ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"), **record}
+        with self._lock:
+            if self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                self._rotate()
+            with self._open() as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def describe(self, text: str) -> str:
+        """Write `text` once per file and return the hash that refers to it."""
+        key = _sha(text)
+        with self._lock:
+            seen = key in self._described
+            self._described.add(key)
+        if not seen:
+            self.write({"event": "description", "hash": key, "text": text})
+        return key
+
+    def store_output(self, text: str) -> str:
+        """Store an output body by content hash and return the reference."""
+        key = _sha(text)
+        path = self.outputs / f"{key}.md"
+        if not path.exists():
+            path.write_text(text, encoding="utf-8")
+        return key
+
+
+class RunLogListener(BaseEventListener):
+    """Translates crew, task and LLM events into JsonlRunLog records."""
+
+    def __init__(self, log: JsonlRunLog):
+        self.log = log
+        self._started: Dict[str, float] = {}
+        self._tokens: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def _task_tokens(self, task_id: Optional[Any]) -> Dict[str, int]:
+        with self._lock:
+            return self._tokens.setdefault(str(task_id) if task_id else "", {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(CrewKickoffStartedEvent)
+        def on_crew_started(source, event: CrewKickoffStartedEvent):
+            self._started[f"crew:{id(source)}"] = time.perf_counter()
+            self.log.write({"event": "crew_started", "crew": event.crew_name, "inputs": event.inputs})
+
+        @crewai_event_bus.on(CrewKickoffCompletedEvent)
+        def on_crew_completed(source, event: CrewKickoffCompletedEvent):
+            started = self._started.pop(f"crew:{id(source)}", None)
+            self.log.write({
+                "event": "crew_completed",
+                "crew": event.crew_name,
+                "duration_s": round(time.perf_counter() - started, 3) if started else None,
+                "total_tokens": event.total_tokens,
+            })
+
+        @crewai_event_bus.on(CrewKickoffFailedEvent)
+        def on_crew_failed(source, event: CrewKickoffFailedEvent):
+            self._started.pop(f"crew:{id(source)}", None)
+            self.log.write({"event": "crew_failed", "crew": event.crew_name, "error": event.error})
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event: TaskStartedEvent):
+            task = event.task
+            task_id = str(task.id)
+            self._started[task_id] = time.perf_counter()
+            self.log.write({
+                "event": "task_started",
+                "task": task.name,
+                "task_id": task_id,
+                "agent": task.agent.role.strip() if task.agent else None,
+                "description": self.log.describe(task.description),
+            })
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event: TaskCompletedEvent):
+            task_id = str(event.task.id) if event.task else None
+            started = self._started.pop(task_id, None)
+            tokens = self._tokens.pop(task_id or "", {})
+            self.log.write({
+                "event": "task_completed",
+                "task": event.output.name,
+                "task_id": task_id,
+                "agent": event.output.agent.strip(),
+                "duration_s": round(time.perf_counter() - started, 3) if started else None,
+                **tokens,
+                "output": self.log.store_output(event.output.raw),
+                "output_chars": len(event.output.raw),
+            })
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event: TaskFailedEvent):
+            task_id = str(event.task.id) if event.task else None
+            started = self._started.pop(task_id, None)
+            self._tokens.pop(task_id or "", None)
+            self.log.write({
+                "event": "task_failed",
+                "task": event.task.name if event.task else None,
+                "task_id": task_id,
+                "duration_s": round(time.perf_counter() - started, 3) if started else None,
+                "error": event.error,
+            })
+
+        # Token counts are estimated (~4 characters per token), matching the rate limiter
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event: LLMCallStartedEvent):
+            counts = self._task_tokens(event.task_id)
+            with self._lock:
+                counts["llm_calls"] += 1
+                counts["prompt_tokens"] += estimate_tokens(event.messages)
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event: LLMCallCompletedEvent):
+            counts = self._task_tokens(event.task_id)
+            with self._lock:
+                counts["completion_tokens"] += estimate_tokens(event.response)
+
+
+_run_log_listener: Optional[RunLogListener] = None
+
+
+def enable_run_log() -> RunLogListener:
+    """Start writing the JSONL run log for every crew in this process (idempotent)."""
+    global _run_log_listener
+    if _run_log_listener is None:
+        _run_log_listener = RunLogListener(
+            JsonlRunLog(
+                directory=os.getenv("RUN_LOG_DIR", "logs"),
+                max_bytes=int(os.getenv("RUN_LOG_MAX_BYTES", "10000000")),
+                backups=int(os.getenv("RUN_LOG_BACKUPS", "5")),
+                compress=os.getenv("RUN_LOG_GZIP", "false").lower() in ("1", "true", "yes"),
+            )
+        )
+    return _run_log_listener
@@ -0,0 +1,313 @@
+"""
+Long-running validation service.
+
+One process keeps crews built ahead of their jobs (CrewPool) and accepts
+validation jobs over HTTP into a persistent SQLite queue (JobQueue). At most
+SERVICE_CONCURRENCY jobs run at once, all sharing the process-wide Gemini
+rate limiter, LLM client and caches, so a job pays neither interpreter
+startup nor crew construction.
+
+    POST /jobs               {"startup_idea": "...", "resume": false} -> 202 + job
+    GET  /jobs/<id>          job status
+    GET  /jobs/<id>/result   the report (text/markdown) once completed, else 409
+    GET  /health             queue counts and pool size
+
+Jobs that were running when the service stopped are queued again on restart
+and resume from their task checkpoints.
+"""
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from crewai import Crew
+
+from startup_validate.cache import DEFAULT_CACHE_PATH
+from startup_validate.config_loader import load_env
+from startup_validate.crew import StartupValidate
+from startup_validate.results import remember_results, reuse_results
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+
+class JobQueue:
+    """
+    Validation jobs in a SQLite table, oldest first. Claiming is atomic, so
+    several worker threads (or service processes on one host) can share it.
+    """
+
+    def __init__(self, path: Optional[str] = None, table: str = "validation_jobs"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid job table name: {table!r}")
+        self.table = table
+        self.path = path or os.getenv("SERVICE_DB") or os.getenv("CACHE_PATH", DEFAULT_CACHE_PATH)
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id TEXT PRIMARY KEY, startup_idea TEXT NOT NULL, resume INTEGER NOT NULL, "
+                "status TEXT NOT NULL, error TEXT, report TEXT, submitted_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_status ON {table} (status, submitted_at)"
+            )
+
+    def requeue_running(self) -> int:
+        """Queue jobs interrupted by a restart again; they resume from their checkpoints."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                f"UPDATE {self.table} SET status = 'queued', resume = 1, started_at = NULL "
+                "WHERE status = 'running'"
+            ).rowcount
+
+    def submit(self, startup_idea: str, resume: bool = False) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO {self.table} (id, startup_idea, resume, status, submitted_at) "
+                "VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, startup_idea, int(resume), time.time()),
+            )
+        return self.get(job_id)
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running and return it, or None if the queue is empty."""
+        with self._lock, self._conn:
+            while True:
+                row = self._conn.execute(
+                    f"SELECT id FROM {self.table} WHERE status = 'queued' "
+                    "ORDER BY submitted_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                # Another process may have claimed it between the two statements
+                claimed = self._conn.execute(
+                    f"UPDATE {self.table} SET status = 'running', started_at = ? "
+                    "WHERE id = ? AND status = 'queued'",
+                    (time.time(), row["id"]),
+                ).rowcount
+                if claimed:
+                    break
+        return self.get(row["id"])
+
+    def finish(self, job_id: str, report: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE {self.table} SET status = ?, report = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error is not None else "completed", report, error, time.time(), job_id),
+            )
+
+    def get(self, job_id: str, with_report: bool = False) -> Optional[Dict[str, Any]]:
+        """The job as a dict (its report only with `with_report`), or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT * FROM {self.table} WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["resume"] = bool(job["resume"])
+        if not with_report:
+            job.pop("report")
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {row[0]: row[1] for row in rows}
+
+
+class CrewPool:
+    """
+    Crews built before their job arrives. Each crew runs one job (task
+    outputs live on the crew), and a background thread builds the next one
+    while the current jobs run.
+    """
+
+    def __init__(self, size: int, process: Optional[str] = None):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        self.process = process
+        self._ready: "queue.Queue[Tuple[StartupValidate, Crew]]" = queue.Queue(maxsize=size)
+        self._filler = threading.Thread(target=self._fill, name="crew-pool", daemon=True)
+        self._filler.start()
+
+    def _build(self, startup_idea: Optional[str] = None, resume: bool = False) -> Tuple[StartupValidate, Crew]:
+        crew_base = StartupValidate(process=self.process, startup_idea=startup_idea, resume=resume)
+        return crew_base, crew_base.crew()
+
+    def _fill(self) -> None:
+        while True:
+            try:
+                crew = self._build()
+            except Exception as e:
+                print(f"Crew pool could not build a crew: {e}")
+                time.sleep(5)
+                continue
+            # Blocks while the pool is full
+            self._ready.put(crew)
+
+    def ready(self) -> int:
+        return self._ready.qsize()
+
+    def acquire(self, startup_idea: str, resume: bool = False) -> Tuple[StartupValidate, Crew]:
+        """A crew for `startup_idea`: a pre-built one when available, otherwise built now."""
+        if resume:
+            # Checkpoints are restored while the crew is built, so it cannot be built ahead
+            return self._build(startup_idea, resume=True)
+        try:
+            crew_base, crew = self._ready.get_nowait()
+        except queue.Empty:
+            crew_base, crew = self._build()
+        crew_base.bind_idea(startup_idea)
+        return crew_base, crew
+
+
+class ValidationService:
+    """Runs queued jobs on `concurrency` worker threads with crews from a CrewPool."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        process: Optional[str] = None,
+        jobs: Optional[JobQueue] = None,
+    ):
+        load_env()
+        self.concurrency = concurrency or int(os.getenv("SERVICE_CONCURRENCY", "2"))
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.jobs = jobs or JobQueue()
+        requeued = self.jobs.requeue_running()
+        if requeued:
+            print(f"Requeued {requeued} interrupted job(s)")
+        self.pool = CrewPool(pool_size or int(os.getenv("SERVICE_POOL_SIZE", str(self.concurrency))), process)
+        self._wakeup = threading.Event()
+        self._workers = [
+            threading.Thread(target=self._work, name=f"validation-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, startup_idea: str, resume: bool = False) -> Dict[str, Any]:
+        job = self.jobs.submit(startup_idea, resume)
+        self._wakeup.set()
+        return job
+
+    def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            job = self.jobs.claim()
+            if job is None:
+                # Also poll, for jobs submitted by another process sharing the queue
+                self._wakeup.wait(timeout=float(os.getenv("SERVICE_POLL_SECONDS", "2")))
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        print(f"[running] {job['id']}: {job['startup_idea']}")
+        try:
+            report, seeded = reuse_results(job["startup_idea"])
+            if report is None:
+                crew_base, crew = self.pool.acquire(job["startup_idea"], job["resume"] or seeded)
+                try:
+                    res = crew.kickoff(inputs={"startup_idea": job["startup_idea"]})
+                    report = crew_base.final_report(res)
+                    remember_results(job["startup_idea"], report, crew_base.task_outputs())
+                finally:
+                    # Each crew runs one job; let it and its outputs be freed
+                    crew_base.release()
+            self.jobs.finish(job["id"], report=report)
+        except Exception as e:
+            self.jobs.finish(job["id"], error=str(e))
+        print(f"[{self.jobs.get(job['id'])['status']}] {job['id']}: {job['startup_idea']}")
+
+    def health(self) -> Dict[str, Any]:
+        return {"jobs": self.jobs.counts(), "concurrency": self.concurrency, "crews_ready": self.pool.ready()}
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a ValidationService (see the module docstring for the routes)."""
+
+    @property
+    def service(self) -> ValidationService:
+        return self.server.service
+
+    def _send(self, status: int, body: Any, content_type: str = "application/json") -> None:
+        data = (body if isinstance(body, str) else json.dumps(body)).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.split("?")[0].rstrip("/") != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            startup_idea = (payload.get("startup_idea") or "").strip()
+        except (ValueError, AttributeError):
+            self._send(400, {"error": "Body must be a JSON object"})
+            return
+        if not startup_idea:
+            self._send(400, {"error": "'startup_idea' is required"})
+            return
+        self._send(202, self.service.submit(startup_idea, bool(payload.get("resume"))))
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if parts == ["health"]:
+            self._send(200, self.service.health())
+            return
+        if len(parts) not in (2, 3) or parts[0] != "jobs" or parts[2:] not in ([], ["result"]):
+            self._send(404, {"error": "Not found"})
+            return
+        job = self.service.jobs.get(parts[1], with_report=len(parts) == 3)
+        if job is None:
+            self._send(404, {"error": "Unknown job"})
+        elif len(parts) == 2:
+            self._send(200, job)
+        elif job["status"] != "completed":
+            self._send(409, {k: v for k, v in job.items() if k != "report"})
+        else:
+            self._send(200, job["report"], "text/markdown; charset=utf-8")
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, service: Optional[ValidationService] = None) -> ThreadingHTTPServer:
+    """HTTP server for `service` (call serve_forever() on the result)."""
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = service or ValidationService()
+    return server
+
+
+def main():
+    """
+    Run the validation service.
+    Usage: validation_service [port] [host]
+    """
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    host = sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1"
+    server = serve(host, port)
+    print(f"Validation service on http://{host}:{port} "
+          f"({server.service.concurrency} concurrent jobs, POST /jobs to submit)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
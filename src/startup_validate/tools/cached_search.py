@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from crewai_tools import SerperDevTool
+from pydantic import Field
+from requests.adapters import HTTPAdapter
+
+from startup_validate.cache import SQLiteCache
+from startup_validate.deadline import TOOL_STOP_MESSAGE, call_timeout, current_budget
+
+_search_cache: Optional[SQLiteCache] = None
+_search_cache_lock = threading.Lock()
+_search_session: Optional[requests.Session] = None
+
+
+def get_search_cache() -> SQLiteCache:
+    """Search result cache shared by every agent and crew in the process."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SQLiteCache(
+                "search_results",
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+                ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "604800")),
+            )
+        return _search_cache
+
+
+def get_search_session() -> requests.Session:
+    """Keep-alive HTTP session shared by every search, with up to SEARCH_POOL_SIZE connections per host."""
+    global _search_session
+    with _search_cache_lock:
+        if _search_session is None:
+            pool_size = int(os.getenv("SEARCH_POOL_SIZE", "16"))
+            _search_session = requests.Session()
+            _search_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+            _search_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+        return _search_session
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, drop punctuation and collapse whitespace so near-identical queries match."""
+    query = re.sub(r"[^\w\s$%.-]", " ", query.casefold())
+    return " ".join(query.split())
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool that reuses results for repeated queries across agents, retries and runs."""
+
+    # SERPER_BASE_URL points searches at a local stand-in server (benchmarks, tests)
+    base_url: str = Field(default_factory=lambda: os.getenv("SERPER_BASE_URL", "https://google.serper.dev"))
+
+    def cache_key(self, search_query: str, search_type: str) -> str:
+        params: Dict[str, Any] = {
+            "q": normalize_query(search_query),
+            "type": search_type.lower(),
+            "num": self.n_results,
+            "gl": self.country,
+            "location": self.location,
+            "hl": self.locale,
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        # SerperDevTool's request, sent over the shared session instead of a new connection per search
+        payload: Dict[str, Any] = {"q": search_query, "num": self.n_results}
+        for name, value in (("gl", self.country), ("location", self.location), ("hl", self.locale)):
+            if value:
+                payload[name] = value
+        response = get_search_session().post(
+            self._get_search_url(search_type),
+            headers={"X-API-KEY": os.environ["SERPER_API_KEY"], "content-type": "application/json"},
+            json=payload,
+            # Capped at what is left of the task's time budget (RUN_DEADLINE)
+            timeout=call_timeout(float(os.getenv("SEARCH_TIMEOUT", "10"))),
+        )
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
+
+    def _run(self, **kwargs: Any) -> Any:
+        search_query = kwargs.get("search_query") or kwargs.get("query")
+        search_type = kwargs.get("search_type", self.search_type)
+        if not search_query:
+            return super()._run(**kwargs)
+
+        cache = get_search_cache()
+        key = self.cache_key(search_query, search_type)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        # With RUN_DEADLINE, a task whose time budget is spent gets no more live searches
+        budget = current_budget()
+        if budget is not None and budget.exhausted():
+            budget.refused_tool_calls += 1
+            return TOOL_STOP_MESSAGE
+
+        results = super()._run(**kwargs)
+        if isinstance(results, dict):
+            cache.set(key, results)
+        return results
@@ -0,0 +1,163 @@
+"""
+Local rendering of QuickChart (Chart.js) configs with matplotlib.
+
+Rendered files are cached by content hash, so an identical chart config,
+size and format is rendered once. matplotlib is an optional dependency:
+install it with `pip install startup_validate[charts]`.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.parse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RENDERABLE_TYPES = ("bar", "line", "pie", "doughnut", "scatter", "sparkline", "progressBar", "radialGauge")
+RENDERABLE_FORMATS = ("png", "svg", "jpeg", "webp")
+
+# pyplot keeps global state, so figures are built one at a time
+_render_lock = threading.Lock()
+
+
+def chart_key(config: Dict[str, Any], width: int, height: int, format: str) -> str:
+    """Content hash of everything that affects the rendered file."""
+    payload = json.dumps({"c": config, "w": width, "h": height, "f": format}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:20]
+
+
+def quickchart_url(config: Dict[str, Any], width: int, height: int, format: str) -> str:
+    """QuickChart.io URL that renders `config` remotely."""
+    params = {"c": json.dumps(config), "width": width, "height": height, "format": format}
+    return f"https://quickchart.io/chart?{urllib.parse.urlencode(params)}"
+
+
+def _color(value: Any, default: str) -> Any:
+    """Chart.js color (hex, named or rgb()/rgba() string) as a matplotlib color."""
+    if not isinstance(value, str):
+        return default
+    match = re.fullmatch(r"rgba?\(([^)]*)\)", value.replace(" ", ""))
+    if not match:
+        return value
+    parts = [float(part) for part in match.group(1).split(",")]
+    rgb = [part / 255 for part in parts[:3]]
+    return (*rgb, parts[3] if len(parts) > 3 else 1.0)
+
+
+def _colors(value: Any, count: int, default: str) -> List[Any]:
+    if isinstance(value, list):
+        return [_color(value[i % len(value)], default) for i in range(count)] if value else [default] * count
+    return [_color(value, default)] * count
+
+
+def _values(data: List[Any]) -> List[float]:
+    return [float(point.get("y", 0)) if isinstance(point, dict) else float(point or 0) for point in data]
+
+
+def _draw(plt: Any, config: Dict[str, Any], width: int, height: int) -> Any:
+    chart_type = config["type"]
+    data = config.get("data", {})
+    datasets = data.get("datasets", [])
+    labels = data.get("labels") or []
+    title = ((config.get("options") or {}).get("plugins") or {}).get("title", {}).get("text")
+
+    fig, ax = plt.subplots(figsize=(width / 100, height / 100), dpi=100)
+    if data.get("backgroundColor"):
+        fig.patch.set_facecolor(_color(data["backgroundColor"], "white"))
+
+    if chart_type in ("bar", "line"):
+        count = max((len(ds.get("data", [])) for ds in datasets), default=0)
+        positions = list(range(count))
+        bar_width = 0.8 / max(len(datasets), 1)
+        for i, ds in enumerate(datasets):
+            values = _values(ds.get("data", []))
+            color = _colors(ds.get("backgroundColor"), len(values), f"C{i}")
+            if chart_type == "bar":
+                offset = (i - (len(datasets) - 1) / 2) * bar_width
+                ax.bar([p + offset for p in positions[: len(values)]], values, bar_width, color=color, label=ds.get("label"))
+            else:
+                ax.plot(positions[: len(values)], values, marker="o", color=_color(ds.get("borderColor"), color[0]), label=ds.get("label"))
+        ax.set_xticks(positions)
+        ax.set_xticklabels([str(label) for label in labels[:count]] or [str(p + 1) for p in positions])
+        if any(ds.get("label") for ds in datasets):
+            ax.legend()
+    elif chart_type == "scatter":
+        for i, ds in enumerate(datasets):
+            points = [p for p in ds.get("data", []) if isinstance(p, dict)]
+            ax.scatter([p.get("x", 0) for p in points], [p.get("y", 0) for p in points],
+                       color=_colors(ds.get("backgroundColor"), 1, f"C{i}")[0], label=ds.get("label"))
+        if any(ds.get("label") for ds in datasets):
+            ax.legend()
+    elif chart_type in ("pie", "doughnut"):
+        values = _values(datasets[0].get("data", [])) if datasets else []
+        colors = _colors(datasets[0].get("backgroundColor") if datasets else None, len(values), "C0")
+        ax.pie(values, labels=[str(label) for label in labels[: len(values)]] or None, colors=colors,
+               autopct="%1.0f%%", wedgeprops={"width": 0.4} if chart_type == "doughnut" else None)
+        ax.axis("equal")
+    elif chart_type == "sparkline":
+        values = _values(datasets[0].get("data", [])) if datasets else []
+        ax.plot(values, color=_colors(datasets[0].get("borderColor") if datasets else None, 1, "C0")[0], linewidth=1.5)
+        ax.axis("off")
+    elif chart_type in ("progressBar", "radialGauge"):
+        value = _values(datasets[0].get("data", []))[0] if datasets and datasets[0].get("data") else 0.0
+        fraction = min(max(value / 100, 0.0), 1.0)
+        color = _colors(datasets[0].get("backgroundColor") if datasets else None, 1, "C0")[0]
+        if chart_type == "progressBar":
+            ax.barh([0], [100], color="#e5e7eb")
+            ax.barh([0], [fraction * 100], color=color)
+            ax.text(50, 0, f"{value:g}%", ha="center", va="center")
+            ax.set_xlim(0, 100)
+            ax.axis("off")
+        else:
+            ax.pie([fraction, 1 - fraction], colors=[color, "#e5e7eb"], startangle=90, counterclock=False,
+                   wedgeprops={"width": 0.25})
+            ax.text(0, 0, f"{value:g}", ha="center", va="center", fontsize=20)
+            ax.axis("equal")
+    else:
+        plt.close(fig)
+        raise ValueError(f"Local rendering does not support chart type {chart_type!r}")
+
+    if title:
+        ax.set_title(title, fontweight="bold")
+    if chart_type in ("sparkline", "progressBar"):
+        # Too small for tight_layout's margins; fill the whole figure
+        fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+    else:
+        fig.tight_layout()
+    return fig
+
+
+def render_chart(
+    config: Dict[str, Any],
+    width: int = 800,
+    height: int = 400,
+    format: str = "png",
+    directory: Optional[str] = None,
+) -> Path:
+    """Render a Chart.js config to `<directory>/<hash>.<format>`, reusing an existing file."""
+    if format not in RENDERABLE_FORMATS:
+        raise ValueError(f"Local rendering supports {', '.join(RENDERABLE_FORMATS)}, not {format!r}")
+    target_dir = Path(directory or os.getenv("CHART_DIR", ".cache/charts"))
+    path = target_dir / f"{chart_key(config, width, height, format)}.{format}"
+    if path.exists():
+        return path
+
+    try:
+        import matplotlib
+    except ImportError as e:
+        raise ImportError("Local chart rendering needs matplotlib: pip install 'startup_validate[charts]'") from e
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with _render_lock:
+        fig = _draw(plt, config, width, height)
+        try:
+            # Write then rename so concurrent readers never see a partial file
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            fig.savefig(tmp, format=format)
+            os.replace(tmp, path)
+        finally:
+            plt.close(fig)
+    return path
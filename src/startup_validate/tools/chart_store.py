@@ -0,0 +1,121 @@
+"""
+Content-addressed chart config store (CHART_RENDER=id).
+
+QuickChartTool stores each chart config here and hands agents a short
+`chart:<id>` reference instead of a URL embedding the whole config. The
+references are expanded into `<img>` tags only when the final report is
+rendered (expand_chart_refs), and `chart_server` resolves them over HTTP.
+"""
+import html
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from startup_validate.cache import SQLiteCache
+from startup_validate.tools.chart_render import chart_key, quickchart_url, render_chart
+
+CHART_REF_RE = re.compile(r"chart:([0-9a-f]{12})\b")
+# Markdown image whose target is a chart reference, e.g. ![Scores](chart:0123456789ab)
+CHART_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(chart:([0-9a-f]{12})\)")
+
+_chart_store: Optional[SQLiteCache] = None
+_chart_store_lock = threading.Lock()
+
+
+def get_chart_store() -> SQLiteCache:
+    """Chart configs by ID, kept in the shared SQLite cache file."""
+    global _chart_store
+    with _chart_store_lock:
+        if _chart_store is None:
+            _chart_store = SQLiteCache(
+                "chart_configs", max_entries=int(os.getenv("CHART_STORE_MAX_ENTRIES", "100000"))
+            )
+        return _chart_store
+
+
+def store_chart(config: Dict[str, Any], width: int, height: int, format: str) -> str:
+    """Store a chart and return its short, stable ID (same chart, same ID)."""
+    chart_id = chart_key(config, width, height, format)[:12]
+    store = get_chart_store()
+    if store.get(chart_id) is None:
+        store.set(chart_id, {"config": config, "width": width, "height": height, "format": format})
+    return chart_id
+
+
+def chart_src(chart_id: str, embed: Optional[str] = None) -> Optional[str]:
+    """
+    Image source for a stored chart: a QuickChart URL ("url"), a locally
+    rendered file ("local"), or the chart server (CHART_SERVER_URL, "server").
+    """
+    embed = embed or os.getenv("CHART_EMBED", "url")
+    if embed == "server":
+        return f"{os.getenv('CHART_SERVER_URL', 'http://127.0.0.1:8765').rstrip('/')}/chart/{chart_id}"
+    spec = get_chart_store().get(chart_id)
+    if spec is None:
+        return None
+    if embed == "local":
+        return str(render_chart(spec["config"], spec["width"], spec["height"], spec["format"]))
+    return quickchart_url(spec["config"], spec["width"], spec["height"], spec["format"])
+
+
+def expand_chart_refs(text: str, embed: Optional[str] = None) -> str:
+    """Replace `![alt](chart:<id>)` and bare `chart:<id>` references with `<img>` tags."""
+    def img(chart_id: str, alt: str, original: str) -> str:
+        src = chart_src(chart_id, embed)
+        if src is None:
+            return original
+        return f'<img src="{html.escape(src)}" alt="{html.escape(alt)}">'
+
+    text = CHART_IMAGE_RE.sub(lambda m: img(m.group(2), m.group(1), m.group(0)), text)
+    return CHART_REF_RE.sub(lambda m: img(m.group(1), "chart", m.group(0)), text)
+
+
+class ChartRequestHandler(BaseHTTPRequestHandler):
+    """Serves GET /chart/<id>: the rendered image when matplotlib is available, else a QuickChart redirect."""
+
+    def do_GET(self):
+        match = re.fullmatch(r"/chart/([0-9a-f]{12})", self.path.split("?")[0])
+        spec = get_chart_store().get(match.group(1)) if match else None
+        if spec is None:
+            self.send_error(404, "Unknown chart")
+            return
+        try:
+            path = render_chart(spec["config"], spec["width"], spec["height"], spec["format"])
+        except ImportError:
+            self.send_response(302)
+            self.send_header("Location", quickchart_url(spec["config"], spec["width"], spec["height"], spec["format"]))
+            self.end_headers()
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/svg+xml" if spec["format"] == "svg" else f"image/{spec['format']}")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_charts(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server resolving chart IDs (call serve_forever() on the result)."""
+    return ThreadingHTTPServer((host, port), ChartRequestHandler)
+
+
+def main():
+    """
+    Resolve chart IDs over HTTP.
+    Usage: chart_server [port] [host]
+    """
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    host = sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1"
+    server = serve_charts(host, port)
+    print(f"Serving charts on http://{host}:{port}/chart/<id>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,8 +1,10 @@
 from crewai.tools import BaseTool
 from typing import Type, List, Dict, Union, Optional, Any
-from pydantic import BaseModel, Field, validator
-import json
-import urllib.parse
+from pydantic import BaseModel, Field, TypeAdapter, validator
+import os
+
+from startup_validate.tools.chart_render import quickchart_url, render_chart
+from startup_validate.tools.chart_store import store_chart
 
 
 class QuickChartToolInput(BaseModel):
@@ -13,8 +15,8 @@ class QuickChartToolInput(BaseModel):
         ..., description="List of datasets with 'label', 'data', optional 'backgroundColor', 'borderColor', 'fill'"
     )
     title: Optional[str] = Field(None, description="Optional title for the chart")
-    width: int = Field(800, description="Width of the chart in pixels (100-2000)")
-    height: int = Field(400, description="Height of the chart in pixels (100-2000)")
+    width: int = Field(800, description="Width of the chart in pixels (20-2000)")
+    height: int = Field(400, description="Height of the chart in pixels (20-2000)")
     theme: Optional[str] = Field("default", description="Chart theme: default, dark, corporate, financial, modern, colorful")
     format: Optional[str] = Field("png", description="Output format: png, jpeg, svg, webp")
     background_color: Optional[str] = Field(None, description="Chart background color (hex, rgb, rgba)")
@@ -46,26 +48,109 @@ class QuickChartToolInput(BaseModel):
         return cleaned_datasets
 
 
+THEME_PALETTES = {
+    "default": ["#3b82f6", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6", "#06b6d4"],
+    "dark": ["#1e40af", "#059669", "#d97706", "#dc2626", "#7c3aed", "#0891b2"],
+    "corporate": ["#1e3a8a", "#047857", "#92400e", "#991b1b", "#5b21b6", "#0e7490"],
+    "financial": ["#1e40af", "#059669", "#d97706", "#dc2626", "#7c3aed", "#0891b2"],
+    "modern": ["#6366f1", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6", "#06b6d4"],
+    "colorful": ["#ff6b6b", "#4ecdc4", "#45b7d1", "#96ceb4", "#feca57", "#ff9ff3"]
+}
+
+# Validates a whole list of chart specs in one pass
+_CHART_SPECS = TypeAdapter(List[QuickChartToolInput])
+
+# Shared instances by render mode (CHART_RENDER)
+_shared_tools: Dict[str, "QuickChartTool"] = {}
+
+
 class QuickChartTool(BaseTool):
     name: str = "QuickChart Generator"
     description: str = (
         "Generates QuickChart.io URLs for rendering professional charts. "
         "Supports common chart types with themes and basic customization. "
-        "Perfect for financial reports and dashboards."
+        "Perfect for financial reports and dashboards. "
+        "Returns a local image path instead of a URL when charts are rendered locally, or a "
+        "chart:<id> reference; embed references as-is, e.g. ![Caption](chart:<id>)."
     )
     args_schema: Type[BaseModel] = QuickChartToolInput
+    # "url": QuickChart.io URL; "local": render with matplotlib into a content-hashed file cache;
+    # "id": short chart:<id> reference to a stored config (see startup_validate.tools.chart_store)
+    render_mode: str = Field(default_factory=lambda: os.getenv("CHART_RENDER", "url"))
+    chart_dir: Optional[str] = None
     
     def _get_theme_colors(self, theme: str) -> List[str]:
         """Get color palette for theme."""
-        palettes = {
-            "default": ["#3b82f6", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6", "#06b6d4"],
-            "dark": ["#1e40af", "#059669", "#d97706", "#dc2626", "#7c3aed", "#0891b2"],
-            "corporate": ["#1e3a8a", "#047857", "#92400e", "#991b1b", "#5b21b6", "#0e7490"],
-            "financial": ["#1e40af", "#059669", "#d97706", "#dc2626", "#7c3aed", "#0891b2"],
-            "modern": ["#6366f1", "#10b981", "#f59e0b", "#ef4444", "#8b5cf6", "#06b6d4"],
-            "colorful": ["#ff6b6b", "#4ecdc4", "#45b7d1", "#96ceb4", "#feca57", "#ff9ff3"]
+        return THEME_PALETTES.get(theme, THEME_PALETTES["default"])
+
+    def _build_config(
+        self,
+        chart_type: str,
+        datasets: List[Dict[str, Any]],
+        labels: Optional[List[str]] = None,
+        title: Optional[str] = None,
+        width: int = 800,
+        height: int = 400,
+        theme: str = "default",
+        background_color: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Validate one chart and build its Chart.js configuration (no I/O, inputs are not modified)."""
+        # Basic validation
+        if not (20 <= width <= 2000) or not (20 <= height <= 2000):
+            raise ValueError("Width and height must be between 20 and 2000 pixels")
+        
+        if not datasets or not isinstance(datasets, list):
+            raise ValueError("Datasets must be a non-empty list")
+        
+        # Apply theme colors if not specified
+        datasets = self._apply_theme_colors([dict(dataset) for dataset in datasets], theme)
+        
+        # Build chart configuration
+        chart_config = {
+            "type": chart_type,
+            "data": {
+                "datasets": datasets
+            }
         }
-        return palettes.get(theme, palettes["default"])
+        
+        # Add labels if provided
+        if labels:
+            chart_config["data"]["labels"] = labels
+        
+        # Add background color
+        if background_color:
+            chart_config["data"]["backgroundColor"] = background_color
+        
+        # Build basic options
+        options = {
+            "responsive": True,
+            "plugins": {
+                "legend": {"display": True, "position": "top"}
+            }
+        }
+        
+        # Add title
+        if title:
+            options["plugins"]["title"] = {
+                "display": True,
+                "text": title,
+                "font": {"size": 16, "weight": "bold"}
+            }
+        
+        chart_config["options"] = options
+        return chart_config
+
+    def _output(self, chart_config: Dict[str, Any], width: int, height: int, format: str) -> str:
+        """Chart URL, the path of the locally rendered file, or a short chart:<id> reference."""
+        # Render locally instead of linking to QuickChart
+        if self.render_mode == "local":
+            return str(render_chart(chart_config, width, height, format, self.chart_dir))
+        
+        # Keep the config out of prompts; the reference is expanded when the report is rendered
+        if self.render_mode == "id":
+            return f"chart:{store_chart(chart_config, width, height, format)}"
+        
+        return quickchart_url(chart_config, width, height, format)
 
     def _run(
         self,
@@ -80,66 +165,29 @@ class QuickChartTool(BaseTool):
         background_color: Optional[str] = None
     ) -> str:
         try:
-            # Basic validation
-            if not (100 <= width <= 2000) or not (100 <= height <= 2000):
-                raise ValueError("Width and height must be between 100 and 2000 pixels")
-            
-            if not datasets or not isinstance(datasets, list):
-                raise ValueError("Datasets must be a non-empty list")
-            
-            # Apply theme colors if not specified
-            datasets = self._apply_theme_colors(datasets, theme)
-            
-            # Build chart configuration
-            chart_config = {
-                "type": chart_type,
-                "data": {
-                    "datasets": datasets
-                }
-            }
-            
-            # Add labels if provided
-            if labels:
-                chart_config["data"]["labels"] = labels
-            
-            # Add background color
-            if background_color:
-                chart_config["data"]["backgroundColor"] = background_color
-            
-            # Build basic options
-            options = {
-                "responsive": True,
-                "plugins": {
-                    "legend": {"display": True, "position": "top"}
-                }
-            }
-            
-            # Add title
-            if title:
-                options["plugins"]["title"] = {
-                    "display": True,
-                    "text": title,
-                    "font": {"size": 16, "weight": "bold"}
-                }
-            
-            chart_config["options"] = options
-            
-            # Build URL parameters
-            params = {
-                "c": json.dumps(chart_config),
-                "width": width,
-                "height": height,
-                "format": format
-            }
-            
-            # Generate URL
-            query_string = urllib.parse.urlencode(params)
-            url = f"https://quickchart.io/chart?{query_string}"
-            
-            return url
+            chart_config = self._build_config(chart_type, datasets, labels, title, width, height, theme, background_color)
+            return self._output(chart_config, width, height, format)
 
         except Exception as e:
             return f"Error generating chart URL: {str(e)}"
+
+    def create_charts(self, charts: List[Union[QuickChartToolInput, Dict[str, Any]]]) -> List[str]:
+        """
+        Generate several charts with this tool instance. Specs are validated
+        together; each entry of the result is a URL/path or an error message.
+        """
+        specs = _CHART_SPECS.validate_python(charts)
+        results = []
+        for spec in specs:
+            try:
+                chart_config = self._build_config(
+                    spec.chart_type, spec.datasets, spec.labels, spec.title,
+                    spec.width, spec.height, spec.theme or "default", spec.background_color
+                )
+                results.append(self._output(chart_config, spec.width, spec.height, spec.format or "png"))
+            except Exception as e:
+                results.append(f"Error generating chart URL: {str(e)}")
+        return results
     
     def _apply_theme_colors(self, datasets: List[Dict], theme: str) -> List[Dict]:
         """Apply theme colors to datasets that don't have colors specified."""
@@ -162,11 +210,22 @@ class QuickChartTool(BaseTool):
         
         return datasets
 
+    @classmethod
+    def shared(cls) -> "QuickChartTool":
+        """
+        Process-wide instance used by the static helpers, so each chart skips
+        tool construction; one per CHART_RENDER mode, read on every call.
+        """
+        render_mode = os.getenv("CHART_RENDER", "url")
+        if render_mode not in _shared_tools:
+            _shared_tools[render_mode] = cls(render_mode=render_mode)
+        return _shared_tools[render_mode]
+
     @staticmethod
     def create_bar_chart(labels: List[str], data: List[float], title: str = None, 
                         theme: str = "default", width: int = 800, height: int = 400) -> str:
         """Create a bar chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="bar",
             labels=labels,
@@ -184,7 +243,7 @@ class QuickChartTool(BaseTool):
     def create_line_chart(labels: List[str], data: List[float], title: str = None,
                          theme: str = "default", width: int = 800, height: int = 400) -> str:
         """Create a line chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="line",
             labels=labels,
@@ -203,7 +262,7 @@ class QuickChartTool(BaseTool):
     def create_pie_chart(labels: List[str], data: List[float], title: str = None,
                         theme: str = "default", width: int = 400, height: int = 400) -> str:
         """Create a pie chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="pie",
             labels=labels,
@@ -220,7 +279,7 @@ class QuickChartTool(BaseTool):
     def create_doughnut_chart(labels: List[str], data: List[float], title: str = None,
                              theme: str = "default", width: int = 400, height: int = 400) -> str:
         """Create a doughnut chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="doughnut",
             labels=labels,
@@ -236,7 +295,7 @@ class QuickChartTool(BaseTool):
     @staticmethod
     def create_sparkline(data: List[float], theme: str = "default") -> str:
         """Create a sparkline chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="sparkline",
             datasets=[{
@@ -250,7 +309,7 @@ class QuickChartTool(BaseTool):
     @staticmethod
     def create_progress_bar(value: float, theme: str = "default") -> str:
         """Create a progress bar."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="progressBar",
             datasets=[{
@@ -264,7 +323,7 @@ class QuickChartTool(BaseTool):
     @staticmethod
     def create_radial_gauge(value: float, theme: str = "default") -> str:
         """Create a radial gauge chart."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type="radialGauge",
             datasets=[{
@@ -280,7 +339,7 @@ class QuickChartTool(BaseTool):
     def create_financial_chart(labels: List[str], data: List[float], 
                               chart_type: str = "line", title: str = None) -> str:
         """Create a financial chart with corporate theme."""
-        tool = QuickChartTool()
+        tool = QuickChartTool.shared()
         return tool._run(
             chart_type=chart_type,
             labels=labels,
@@ -293,3 +352,22 @@ class QuickChartTool(BaseTool):
             width=1000,
             height=500
         )
+
+
+class QuickChartBatchToolInput(BaseModel):
+    """Input schema for QuickChartBatchTool."""
+    charts: List[QuickChartToolInput] = Field(..., description="Chart specs, each with the same fields as QuickChart Generator")
+
+
+class QuickChartBatchTool(BaseTool):
+    name: str = "QuickChart Batch Generator"
+    description: str = (
+        "Generates several charts in one call (for example one per scoring dimension). "
+        "Takes a list of chart specs with the same fields as QuickChart Generator and "
+        "returns one numbered URL (or local image path) per chart, in order."
+    )
+    args_schema: Type[BaseModel] = QuickChartBatchToolInput
+
+    def _run(self, charts: List[Any]) -> str:
+        results = QuickChartTool.shared().create_charts(charts)
+        return "\n".join(f"{n}. {result}" for n, result in enumerate(results, start=1))
@@ -0,0 +1,230 @@
+"""
+Local BM25 index over earlier research, searched before the web.
+
+Indexed sources: text and markdown files in KNOWLEDGE_DIR (default
+`knowledge/`), every checkpointed task output under CHECKPOINT_DIR and the
+last report (`res.md`). Files are split into paragraph chunks. The index is
+updated incrementally: at most every REFRESH_SECONDS a search re-checks file
+modification times, indexes only new or changed files and drops deleted ones.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+import numpy as np
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+KNOWLEDGE_TOOL_NAME = "Search prior research"
+REFRESH_SECONDS = 10.0
+# Replaced and deleted chunks are compacted away once they are this many and over half of the index
+COMPACT_MIN_DEAD = 64
+CHUNK_WORDS = 180
+TEXT_SUFFIXES = (".txt", ".md", ".markdown")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in re.findall(r"\w+", text.casefold()) if token not in STOPWORDS and len(token) > 1]
+
+
+def chunk_text(text: str, max_words: int = CHUNK_WORDS) -> List[str]:
+    """Paragraph-aligned chunks of up to about `max_words` words, each led by its latest heading."""
+    chunks: List[str] = []
+    heading, current, words = "", [], 0
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if paragraph.startswith("#"):
+            heading = paragraph.splitlines()[0].lstrip("# ").strip()
+        size = len(paragraph.split())
+        if current and words + size > max_words:
+            chunks.append("\n\n".join(current))
+            current, words = [f"({heading})"] if heading else [], 0
+        current.append(paragraph)
+        words += size
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class KnowledgeIndex:
+    """
+    BM25 (k1, b) over chunks, with postings kept per term so that adding or
+    replacing a source touches only that source's chunks.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks: List[Tuple[str, str]] = []  # (source label, text)
+        self.lengths: List[int] = []
+        self.alive: List[bool] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.sources: Dict[str, Tuple[float, List[int]]] = {}  # path -> (mtime, chunk ids)
+        self._files: set = set()  # sources indexed by refresh(), dropped when their file is gone
+        self._dead = 0
+        self._lock = threading.Lock()
+        self._refreshed = 0.0
+
+    def add(self, key: str, label: str, text: str, mtime: float = 0.0) -> int:
+        """Index `text` under `key`, replacing what was indexed for it before. Returns the chunk count."""
+        with self._lock:
+            self._remove(key)
+            ids = []
+            for chunk in chunk_text(text):
+                chunk_id = len(self.chunks)
+                tokens = tokenize(chunk)
+                self.chunks.append((label, chunk))
+                self.lengths.append(len(tokens))
+                self.alive.append(True)
+                for term, tf in Counter(tokens).items():
+                    self.postings.setdefault(term, {})[chunk_id] = tf
+                ids.append(chunk_id)
+            self.sources[key] = (mtime, ids)
+            return len(ids)
+
+    def _remove(self, key: str) -> None:
+        _, ids = self.sources.pop(key, (0.0, []))
+        for chunk_id in ids:
+            self.alive[chunk_id] = False
+            for term in set(tokenize(self.chunks[chunk_id][1])):
+                postings = self.postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self.postings[term]
+        self._dead += len(ids)
+        if self._dead >= COMPACT_MIN_DEAD and self._dead * 2 > len(self.chunks):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop dead chunks and renumber the live ones."""
+        remap: Dict[int, int] = {}
+        chunks, lengths = [], []
+        for chunk_id, alive in enumerate(self.alive):
+            if alive:
+                remap[chunk_id] = len(chunks)
+                chunks.append(self.chunks[chunk_id])
+                lengths.append(self.lengths[chunk_id])
+        self.postings = {term: {remap[i]: tf for i, tf in postings.items()} for term, postings in self.postings.items()}
+        self.sources = {key: (mtime, [remap[i] for i in ids]) for key, (mtime, ids) in self.sources.items()}
+        self.chunks, self.lengths, self.alive = chunks, lengths, [True] * len(chunks)
+        self._dead = 0
+
+    def refresh(self, force: bool = False) -> None:
+        """Index new or changed files from the knowledge directory, checkpoints and res.md, and drop deleted ones."""
+        if not force and time.monotonic() - self._refreshed < REFRESH_SECONDS:
+            return
+        self._refreshed = time.monotonic()
+        found = set()
+        for path, read in _sources():
+            found.add(str(path))
+            try:
+                mtime = path.stat().st_mtime
+                if self.sources.get(str(path), (None,))[0] == mtime:
+                    continue
+                label, text = read(path)
+            except (OSError, ValueError, KeyError):
+                continue
+            self.add(str(path), label, text, mtime)
+        with self._lock:
+            for key in self._files - found:
+                self._remove(key)
+            self._files = found
+
+    def search(self, query: str, top_k: int = 4) -> List[Tuple[float, str, str]]:
+        """Best matching live chunks as (score, source label, text)."""
+        terms = set(tokenize(query))
+        with self._lock:
+            live = sum(self.alive)
+            if not terms or not live:
+                return []
+            lengths = np.asarray(self.lengths, dtype=np.float64)
+            average = lengths[np.asarray(self.alive)].mean() or 1.0
+            norms = self.k1 * (1 - self.b + self.b * lengths / average)
+            scores = np.zeros(len(self.chunks))
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                ids = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                tf = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+                idf = math.log(1 + (live - len(postings) + 0.5) / (len(postings) + 0.5))
+                scores[ids] += idf * tf * (self.k1 + 1) / (tf + norms[ids])
+            best = np.argsort(-scores)[:top_k]
+            return [(float(scores[i]), *self.chunks[i]) for i in best if scores[i] > 0]
+
+
+def _read_text(label: str):
+    return lambda path: (label, path.read_text(encoding="utf-8"))
+
+
+def _read_checkpoint(path: Path) -> Tuple[str, str]:
+    record = json.loads(path.read_text(encoding="utf-8"))
+    label = f"{path.stem} for {record.get('source_idea', record.get('startup_idea', ''))!r}"
+    if "source_idea" in record:
+        # Seeded from an earlier run: the analysis is of the idea it was produced for
+        label += f" (reused for {record.get('startup_idea', '')!r})"
+    return label, record["output"]["raw"]
+
+
+def _sources():
+    """(path, reader) for every indexable file; the reader returns (source label, text)."""
+    knowledge_dir = Path(os.getenv("KNOWLEDGE_DIR", "knowledge"))
+    if knowledge_dir.is_dir():
+        for path in sorted(knowledge_dir.rglob("*")):
+            if path.is_file() and path.suffix.lower() in TEXT_SUFFIXES:
+                yield path, _read_text(f"knowledge/{path.relative_to(knowledge_dir)}")
+    checkpoint_dir = Path(os.getenv("CHECKPOINT_DIR", ".checkpoints"))
+    if checkpoint_dir.is_dir():
+        for path in sorted(checkpoint_dir.glob("*/*.json")):
+            yield path, _read_checkpoint
+    report = Path("res.md")
+    if report.is_file():
+        yield report, _read_text("previous report (res.md)")
+
+
+_knowledge_index: Optional[KnowledgeIndex] = None
+_knowledge_index_lock = threading.Lock()
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """The process-wide index, shared by every agent and crew."""
+    global _knowledge_index
+    with _knowledge_index_lock:
+        if _knowledge_index is None:
+            _knowledge_index = KnowledgeIndex()
+        return _knowledge_index
+
+
+class KnowledgeSearchToolInput(BaseModel):
+    """Input schema for KnowledgeSearchTool."""
+    query: str = Field(..., description="What to look up, e.g. 'AI recruiting market size'")
+
+
+class KnowledgeSearchTool(BaseTool):
+    name: str = KNOWLEDGE_TOOL_NAME
+    description: str = (
+        "Searches earlier validation reports and the local knowledge notes. Use it before "
+        "searching the internet: when it already covers the topic, no web search is needed."
+    )
+    args_schema: Type[BaseModel] = KnowledgeSearchToolInput
+    top_k: int = Field(default_factory=lambda: int(os.getenv("KNOWLEDGE_TOP_K", "4")))
+
+    def _run(self, query: str) -> str:
+        index = get_knowledge_index()
+        index.refresh()
+        results = index.search(query, self.top_k)
+        if not results:
+            return f"No prior research matches {query!r}; search the internet instead."
+        return "\n\n---\n\n".join(f"[{source}]\n{text}" for _, source, text in results)
@@ -0,0 +1,28 @@
+import pytest
+
+from startup_validate.benchmark import FakeLLM, FakeSerperServer
+from startup_validate.llm import override_llm
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Fake LLM and Serper stand-in, with caches, checkpoints and logs under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    for name, value in {
+        "CACHE_PATH": str(tmp_path / "cache.sqlite"),
+        "CHECKPOINT_DIR": str(tmp_path / "checkpoints"),
+        "RUN_LOG_DIR": str(tmp_path / "logs"),
+        "GEMINI_RPM": "1000000",
+        "GEMINI_TPM": "1000000000",
+        "SERPER_API_KEY": "test",
+        "CREW_PROCESS": "fast",
+        "SERVICE_POLL_SECONDS": "0.1",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    }.items():
+        monkeypatch.setenv(name, value)
+    override_llm(FakeLLM(latency=0))
+    with FakeSerperServer(latency=0) as server:
+        monkeypatch.setenv("SERPER_BASE_URL", server.url)
+        yield tmp_path
+    override_llm(None)
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from startup_validate.batch import load_ideas
+
+
+def test_ideas_keep_ids_and_prior_ideas(tmp_path):
+    ideas = tmp_path / "ideas.jsonl"
+    ideas.write_text(
+        json.dumps({"id": "a-1", "startup_idea": "idea", "prior_idea": "old idea"}) + "\n\n"
+        + json.dumps({"startup_idea": "other idea"}) + "\n"
+    )
+    assert load_ideas(str(ideas)) == [
+        {"id": "a-1", "startup_idea": "idea", "prior_idea": "old idea"},
+        {"id": "2", "startup_idea": "other idea"},
+    ]
+
+
+@pytest.mark.parametrize("idea_id", ["../escape", "a/b", "/tmp/x", ".."])
+def test_ids_that_are_not_file_names_are_rejected(tmp_path, idea_id):
+    ideas = tmp_path / "ideas.jsonl"
+    ideas.write_text(json.dumps({"id": idea_id, "startup_idea": "idea"}) + "\n")
+    with pytest.raises(ValueError, match="invalid 'id'"):
+        load_ideas(str(ideas))
@@ -0,0 +1,37 @@
+from startup_validate.checkpoint import CheckpointStore
+from startup_validate.crew import RestoredCrew, StartupValidate
+
+IDEA = "idea with checkpoints"
+
+
+def _run(resume=False):
+    crew_base = StartupValidate(process="fast", startup_idea=IDEA, resume=resume)
+    try:
+        crew = crew_base.crew()
+        return crew, crew.kickoff(inputs={"startup_idea": IDEA})
+    finally:
+        crew_base.release()
+
+
+def test_finished_runs_are_not_resumed(offline):
+    _run()
+    checkpoints = CheckpointStore(IDEA)
+    assert checkpoints.completed() == {}
+    # The outputs stay on disk for the prior research index
+    assert len(list(checkpoints.directory.glob("*.json"))) == 6
+
+    crew, _ = _run(resume=True)
+    assert not isinstance(crew, RestoredCrew)
+    assert len(crew.tasks) == 6
+
+
+def test_fully_checkpointed_run_is_not_run_again(offline):
+    _, first = _run()
+    checkpoints = CheckpointStore(IDEA)
+    # As if the process had stopped after the final report, before the run was marked finished
+    checkpoints._finished_path.unlink()
+
+    crew, result = _run(resume=True)
+    assert isinstance(crew, RestoredCrew)
+    assert result.raw == first.raw
+    assert checkpoints.completed() == {}
@@ -0,0 +1,22 @@
+from startup_validate.compaction import CompactingCrew
+from startup_validate.crew import StartupValidate
+
+
+def test_crew_run_passes_compacted_context(offline, monkeypatch):
+    # CompactingCrew overrides crewAI's private Crew._get_context; this fails if a crewAI upgrade stops calling it
+    monkeypatch.setenv("CONTEXT_BUDGET_VALIDATION_SCORING_TASK", "50")
+    contexts = {}
+    get_context = CompactingCrew._get_context
+
+    def recording_get_context(self, task, task_outputs):
+        contexts[task.name] = get_context(self, task, task_outputs)
+        return contexts[task.name]
+
+    monkeypatch.setattr(CompactingCrew, "_get_context", recording_get_context)
+    crew_base = StartupValidate(process="fast")
+    try:
+        crew_base.crew().kickoff(inputs={"startup_idea": "idea with compacted context"})
+    finally:
+        crew_base.release()
+    assert "validation_scoring_task" in contexts
+    assert "digest of" in contexts["validation_scoring_task"]
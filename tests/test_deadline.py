@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+from startup_validate.deadline import Deadline
+
+
+def _tasks(*names):
+    return [SimpleNamespace(name=name, id=f"{name}-id") for name in names]
+
+
+def test_phase_shares_of_a_full_run():
+    deadline = Deadline(100)
+    deadline.register(_tasks("market_analysis_task", "validation_scoring_task", "manager_report_task"))
+    deadline.start()
+    assert deadline.allot("market_analysis_task") == pytest.approx(55, abs=0.1)
+    assert deadline.allot("validation_scoring_task") == pytest.approx(100 * 0.2 / 0.45, abs=0.1)
+    deadline.close()
+
+
+def test_restored_research_leaves_its_share_to_later_phases():
+    deadline = Deadline(100)
+    deadline.register(_tasks("validation_scoring_task", "manager_report_task"))
+    deadline.start()
+    scoring = deadline.allot("validation_scoring_task")
+    assert scoring == pytest.approx(100 * 0.2 / 0.45, abs=0.1)
+    # The report phase gets whatever scoring leaves; nothing is held back for research
+    assert deadline.allot("manager_report_task") == pytest.approx(100, abs=0.1)
+    deadline.close()
+
+
+def test_request_timeouts_are_capped_at_the_time_left(monkeypatch):
+    from startup_validate import deadline as deadline_module
+
+    run = Deadline(10)
+    tasks = _tasks("validation_scoring_task")
+    run.register(tasks)
+    run.start()
+    assert deadline_module.call_timeout(30) == 30  # no task running on this thread yet
+    budget = deadline_module.enter_task(tasks[0])
+    assert deadline_module.call_timeout(30) == pytest.approx(budget.seconds * 1.2, abs=0.1)
+    assert deadline_module.call_timeout(2) == 2
+    monkeypatch.setattr(budget, "started", budget.started - 100)
+    assert deadline_module.call_timeout(30) == deadline_module.MIN_CALL_TIMEOUT
+    run.close()
+    run.start()  # clears this thread's budget
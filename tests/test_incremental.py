@@ -0,0 +1,27 @@
+from startup_validate.incremental import SPECIALIST_TASKS, affected_tasks, words
+
+IDEA = "AI interviewer that ranks job candidates from simulated work scenarios, priced at $49 per month per seat."
+
+
+def test_words_drop_surrounding_punctuation_but_keep_amounts():
+    assert words("Priced at $49.99 per seat. Growing 18%, (fast)") == [
+        "priced", "at", "$49.99", "per", "seat", "growing", "18%", "fast",
+    ]
+
+
+def test_clause_appended_to_a_sentence_affects_only_its_own_task():
+    edited = IDEA[:-1] + ", raising a seed round."
+    assert affected_tasks(IDEA, edited) == ["funding_analysis_task"]
+
+
+def test_punctuation_only_edit_affects_nothing():
+    edited = IDEA.replace(", priced", ". Priced")
+    assert affected_tasks(IDEA, edited) == []
+
+
+def test_price_change_is_attributed_by_its_context():
+    assert affected_tasks(IDEA, IDEA.replace("$49", "$99")) == ["business_model_task"]
+
+
+def test_product_change_affects_every_task():
+    assert affected_tasks(IDEA, IDEA.replace("job candidates", "recruiters")) == list(SPECIALIST_TASKS)
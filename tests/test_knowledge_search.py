@@ -0,0 +1,32 @@
+import os
+
+from startup_validate.tools.knowledge_search import KnowledgeIndex
+
+
+def test_deleted_files_leave_the_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    (tmp_path / "knowledge").mkdir()
+    note = tmp_path / "knowledge" / "recruiting.md"
+    note.write_text("# Recruiting\n\nThe AI recruiting market is worth $600M.", encoding="utf-8")
+    index = KnowledgeIndex()
+    index.refresh(force=True)
+    assert index.search("recruiting market")
+
+    note.unlink()
+    index.refresh(force=True)
+    assert index.search("recruiting market") == []
+    assert index.sources == {}
+
+
+def test_rewritten_files_do_not_grow_the_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    report = tmp_path / "res.md"
+    index = KnowledgeIndex()
+    for version in range(200):
+        report.write_text(f"# Report {version}\n\nFunding round number {version} closed.", encoding="utf-8")
+        os.utime(report, (version + 1, version + 1))
+        index.refresh(force=True)
+    assert len(index.chunks) < 200
+    assert [text for _, _, text in index.search("funding round")] == ["# Report 199\n\nFunding round number 199 closed."]
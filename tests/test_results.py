@@ -0,0 +1,33 @@
+import json
+
+from crewai.tasks.task_output import TaskOutput
+
+from startup_validate.checkpoint import CheckpointStore
+from startup_validate.results import _seed_checkpoints
+from startup_validate.tools.knowledge_search import _read_checkpoint
+
+
+def _output(name, raw):
+    return TaskOutput(name=name, description=name, raw=raw, agent="analyst")
+
+
+def test_seeding_replaces_checkpoints_and_records_the_source(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHECKPOINT_DIR", str(tmp_path))
+    checkpoints = CheckpointStore("edited idea")
+    # Left by an interrupted run of the edited idea
+    checkpoints.save(_output("business_model_task", "stale pricing"))
+    checkpoints.save(_output("validation_scoring_task", "stale score"))
+
+    prior = {
+        "startup_idea": "prior idea",
+        "outputs": {name: _output(name, f"prior {name}") for name in ("market_analysis_task", "business_model_task")},
+    }
+    assert _seed_checkpoints("edited idea", prior, ["market_analysis_task"]) == ["market_analysis_task"]
+    assert {name: output.raw for name, output in checkpoints.completed().items()} == {
+        "market_analysis_task": "prior market_analysis_task",
+    }
+
+    path = checkpoints.directory / "market_analysis_task.json"
+    assert json.loads(path.read_text())["source_idea"] == "prior idea"
+    label, _ = _read_checkpoint(path)
+    assert label == "market_analysis_task for 'prior idea' (reused for 'edited idea')"
@@ -0,0 +1,56 @@
+import gc
+import time
+
+from startup_validate.crew import StartupValidate
+from startup_validate.service import JobQueue, ValidationService
+
+
+def _run_jobs(service, count, offset=0):
+    ids = [service.submit(f"idea {offset + i}")["id"] for i in range(count)]
+    deadline = time.monotonic() + 120
+    while any(service.jobs.get(job_id)["status"] in ("queued", "running") for job_id in ids):
+        assert time.monotonic() < deadline, "jobs did not finish"
+        time.sleep(0.05)
+    assert all(service.jobs.get(job_id)["status"] == "completed" for job_id in ids)
+
+
+def _live_crews():
+    gc.collect()
+    return sum(isinstance(obj, StartupValidate) for obj in gc.get_objects())
+
+
+def test_finished_crews_are_freed(offline):
+    service = ValidationService(concurrency=1, pool_size=1, jobs=JobQueue(str(offline / "jobs.sqlite")))
+    _run_jobs(service, 2)
+    live = _live_crews()
+    _run_jobs(service, 4, offset=2)
+    # Only the pre-built crew (and the one being built) stay alive, however many jobs ran
+    assert _live_crews() <= live
+
+
+def _memo_caches(klass):
+    """crewAI's per-method memo caches (crewai.project.utils.memoize) on `klass`."""
+    caches = []
+    for base in klass.__mro__:
+        for method in vars(base).values():
+            code = getattr(method, "__code__", None)
+            if code is not None and "cache" in code.co_freevars:
+                caches.append(method.__closure__[code.co_freevars.index("cache")].cell_contents)
+    return caches
+
+
+def test_release_empties_crewai_caches(offline):
+    # release() reaches into crewAI internals; this fails if a crewAI upgrade moves them
+    from crewai.events.event_listener import event_listener
+
+    crew_base = StartupValidate(process="fast", startup_idea="idea to release")
+    crew = crew_base.crew()
+    crew.kickoff(inputs={"startup_idea": "idea to release"})
+    caches = _memo_caches(StartupValidate)
+    held = [key for cache in caches for key in cache if key[0] and key[0][0] is crew_base]
+    assert held, "crewAI no longer memoizes @agent/@task/@crew in closure caches"
+    assert any(crew_task in event_listener.execution_spans for crew_task in crew_base.tasks)
+
+    crew_base.release()
+    assert not [key for cache in caches for key in cache if key[0] and key[0][0] is crew_base]
+    assert not any(crew_task in event_listener.execution_spans for crew_task in crew_base.tasks)